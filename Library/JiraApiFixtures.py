@@ -0,0 +1,51 @@
+from concurrent.futures import ThreadPoolExecutor
+from robot.api.deco import keyword, library
+from robot.api import logger
+
+from JiraConfig import PROJECT_KEY
+from JiraRestClient import jira_request
+from JiraCreateMetadata import issue_type_id
+
+# Fixture creation is network-bound; a few workers are plenty
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="jira-fixture")
+
+
+def create_issue(email, token, issue_type, summary, description="", parent_key=None):
+    """Create an issue over REST and return its key."""
+    fields = {
+        "project": {"key": PROJECT_KEY},
+        "summary": summary,
+        "description": description,
+        "issuetype": {"id": issue_type_id(issue_type)},
+    }
+    if parent_key:
+        fields["parent"] = {"key": parent_key}
+
+    response = jira_request(
+        "POST", "/rest/api/2/issue", email=email, token=token,
+        expected_status=201, json={"fields": fields},
+    )
+    return response.json()["key"]
+
+
+@library
+class JiraApiFixtures:
+    """
+    Robot library for creating API fixtures in the background.
+
+    `Start Create Jira Issue` returns a future straight away, so the test can warm the
+    browser (`Start Browser Session`) while the REST call is in flight, then collect
+    the key with `Wait For Jira Issue`.
+    """
+
+    @keyword("Start Create Jira Issue")
+    def start_create_jira_issue(self, email, token, issue_type, summary, description="", parent_key=None):
+        """Submit issue creation to a worker thread and return a future-style handle."""
+        return _executor.submit(create_issue, email, token, issue_type, summary, description, parent_key)
+
+    @keyword("Wait For Jira Issue")
+    def wait_for_jira_issue(self, handle, timeout=60):
+        """Block until the background creation finishes and return the issue key."""
+        issue_key = handle.result(timeout=float(timeout))
+        logger.info(f"Background fixture created: {issue_key}")
+        return issue_key
@@ -0,0 +1,286 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, a single runner per profile
+    fcntl = None
+from robot.api.deco import keyword, library
+import JiraPlaywright as pw
+from robot.api import logger
+
+from JiraConfig import COOKIE_PATH, JIRA_BASE_URL, RESULTS_DIR
+from JiraLaunchProfile import launch_args, context_options
+from JiraMemorySampler import MemorySampler
+from JiraResultFiles import append_csv_row
+
+LOGIN_URL = "https://id.atlassian.com/login"
+
+# Profiling mode: record a Playwright trace per UI keyword for JiraTraceProfiler.py
+PROFILE_TRACES = os.getenv("JIRA_PROFILE_TRACES", "0") == "1"
+TRACE_DIR = os.getenv("JIRA_TRACE_DIR", os.path.join(RESULTS_DIR, "traces"))
+
+# Opt-in persistent profile: Jira's HTTP and V8 code caches survive between keywords and runs
+PERSISTENT_PROFILE = os.getenv("JIRA_PERSISTENT_PROFILE", "0") == "1"
+PROFILE_DIR = os.getenv(
+    "JIRA_BROWSER_PROFILE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "jira-automation", "chromium-profile"),
+)
+# Chromium locks its user-data dir; parallel runners each take a free slot (PROFILE_DIR, PROFILE_DIR-1, ...)
+PROFILE_SLOTS = int(os.getenv("JIRA_BROWSER_PROFILE_SLOTS", "4"))
+# Per-keyword storage reset for the persistent profile (cookies are reset separately);
+# the HTTP cache and V8 code cache are deliberately kept
+RESET_STORAGE_TYPES = "local_storage,indexeddb,websql,service_workers,cache_storage,file_systems,shared_storage"
+RESET_ORIGINS = [JIRA_BASE_URL, "https://id.atlassian.com"]
+PAGE_LOAD_REPORT = os.getenv("JIRA_PAGE_LOAD_REPORT", os.path.join(RESULTS_DIR, "page_load_times.csv"))
+
+_PAGE_LOAD_JS = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    const bundles = resources.filter(r => r.initiatorType === 'script' || r.initiatorType === 'link');
+    return {
+        dcl_ms: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+        resources: resources.length,
+        bundles: bundles.length,
+        bundles_from_cache: bundles.filter(r => r.transferSize === 0 && r.decodedBodySize > 0).length,
+        transfer_kb: Math.round(resources.reduce((sum, r) => sum + (r.transferSize || 0), 0) / 1024),
+    };
+}
+"""
+
+# Session started ahead of time by `Start Browser Session`, handed to the next UI keyword
+_warm_session = None
+
+
+def load_cookies():
+    if not os.path.exists(COOKIE_PATH):
+        raise FileNotFoundError("jira_cookies.json not found in Library folder")
+    with open(COOKIE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def acquire_profile_dir():
+    """
+    (profile_dir, lock_file) reserved for this process until the lock file is closed.
+    Each slot keeps its own warm cache across runs; raises when every slot is busy.
+    """
+    if fcntl is None:
+        return PROFILE_DIR, None
+    for slot in range(PROFILE_SLOTS):
+        path = PROFILE_DIR if slot == 0 else f"{PROFILE_DIR}-{slot}"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        lock = open(f"{path}.lock", "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return path, lock
+        except OSError:
+            lock.close()
+    raise RuntimeError(
+        f"All {PROFILE_SLOTS} persistent browser profiles at {PROFILE_DIR} are in use by other runs; "
+        "raise JIRA_BROWSER_PROFILE_SLOTS or run with JIRA_PERSISTENT_PROFILE=0"
+    )
+
+
+class BrowserSession:
+    """Playwright driver, browser, context and page for one UI keyword."""
+
+    def __init__(self, slow_mo=100, default_timeout=60000):
+        cookies = load_cookies()
+        self.slow_mo = slow_mo
+        self.memory = MemorySampler()
+        self.playwright = self.browser = self.context = self.profile_lock = None
+        try:
+            self.memory.start()
+            self.playwright = pw.sync_playwright().start()
+            if PERSISTENT_PROFILE:
+                profile_dir, self.profile_lock = acquire_profile_dir()
+                self.cache_state = "warm" if os.path.isdir(os.path.join(profile_dir, "Default", "Cache")) else "cold"
+                self.context = self.playwright.chromium.launch_persistent_context(
+                    profile_dir, headless=True, slow_mo=slow_mo, args=launch_args(), **context_options()
+                )
+            else:
+                self.cache_state = "ephemeral"
+                # headless True recommended for container runs; lean args/context from JiraLaunchProfile
+                self.browser = self.playwright.chromium.launch(headless=True, slow_mo=slow_mo, args=launch_args())
+                self.context = self.browser.new_context(**context_options())
+
+            # Always start from the stored session cookies only
+            self.context.clear_cookies()
+            try:
+                self.context.add_cookies(cookies)
+            except Exception as e:
+                logger.console(f"Cookie load issue: {e}")
+                logger.console("Proceeding without valid cookies...")
+
+            if PROFILE_TRACES:
+                # Snapshots are needed for network timings in the trace; screenshots are not
+                self.context.tracing.start(screenshots=False, snapshots=True, sources=False)
+
+            # A persistent context opens with a blank page already
+            self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
+            self.page.set_default_timeout(default_timeout)
+            if PERSISTENT_PROFILE:
+                self._reset_site_storage()
+        except Exception:
+            self.close()
+            raise
+
+    def _reset_site_storage(self):
+        """Isolate keywords sharing the profile: drop storage, keep the HTTP/code caches."""
+        cdp = self.context.new_cdp_session(self.page)
+        try:
+            for origin in RESET_ORIGINS:
+                cdp.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": RESET_STORAGE_TYPES})
+        finally:
+            cdp.detach()
+
+    def open_jira_home(self, path=""):
+        """Load Jira (or `path` under it) and fail fast if the stored cookies no longer authenticate."""
+        page = self.page
+        logger.console("Navigating to Jira...")
+        try:
+            started = time.perf_counter()
+            page.goto(f"{JIRA_BASE_URL}{path}", wait_until="domcontentloaded", timeout=60000)
+            self._record_page_load((time.perf_counter() - started) * 1000.0)
+            # If Atlassian redirected to login, treat as expired cookie
+            if "login" in page.url.lower():
+                logger.console("Invalid/expired session detected → redirected to login")
+                raise pw.TimeoutError("Session expired → login required")
+        except pw.TimeoutError:
+            logger.console("Cookie session expired — navigating to login page to surface issue")
+            try:
+                page.goto(LOGIN_URL, wait_until="domcontentloaded")
+            except Exception:
+                pass
+            raise
+
+    def _record_page_load(self, goto_ms):
+        """Log Jira home load time with cache state and append it to results/page_load_times.csv."""
+        try:
+            stats = self.page.evaluate(_PAGE_LOAD_JS)
+        except Exception:
+            stats = {}
+        row = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "cache_state": self.cache_state,
+            "goto_ms": round(goto_ms),
+            "dcl_ms": stats.get("dcl_ms"),
+            "bundles": stats.get("bundles"),
+            "bundles_from_cache": stats.get("bundles_from_cache"),
+            "transfer_kb": stats.get("transfer_kb"),
+        }
+        logger.info(
+            f"Jira home loaded in {row['goto_ms']} ms ({row['cache_state']} cache, "
+            f"{row['bundles_from_cache']}/{row['bundles']} bundles from cache, {row['transfer_kb']} KB transferred)"
+        )
+        try:
+            append_csv_row(PAGE_LOAD_REPORT, row)
+        except OSError as e:
+            logger.console(f"Warning: could not write page load report: {e}")
+
+    def save_trace(self, name):
+        """Write the trace of this session to results/traces/<name>/<timestamp>.zip."""
+        if not PROFILE_TRACES:
+            return
+        trace_path = os.path.join(TRACE_DIR, name, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.zip")
+        os.makedirs(os.path.dirname(trace_path), exist_ok=True)
+        try:
+            self.context.tracing.stop(path=trace_path)
+            logger.info(f"Playwright trace saved: {trace_path}")
+        except Exception as e:
+            logger.console(f"Warning: could not save trace for {name}: {e}")
+
+    def close(self):
+        for closer in (
+            lambda: self.context.close(),
+            lambda: self.browser.close(),
+            lambda: self.playwright.stop(),
+            lambda: self.profile_lock.close(),
+        ):
+            try:
+                closer()
+            except Exception:
+                pass
+        self.memory.stop()
+
+
+def _take_warm_session():
+    global _warm_session
+    session, _warm_session = _warm_session, None
+    if session is not None and session.page.is_closed():
+        session.close()
+        return None
+    return session
+
+
+@contextmanager
+def jira_page(name, slow_mo=100, default_timeout=60000, start_path=""):
+    """
+    Yield an authenticated page already on Jira home, closing everything afterwards.
+    A new session opens `start_path` directly; a warm session is still on Jira home.
+
+    Picks up the session warmed by `Start Browser Session` when one is waiting, so the
+    browser cold start overlaps with whatever the test did before this keyword.
+    `name` identifies the keyword in traces and profiles. A warm session launched with a
+    different slow_mo is discarded, since slow_mo is fixed at browser launch.
+    """
+    session = _take_warm_session()
+    if session is not None and session.slow_mo != slow_mo:
+        logger.console(
+            f"Warning: pre-warmed session uses slow_mo={session.slow_mo}, {name} needs {slow_mo}; "
+            "starting a new browser (pass slow_mo to Start Browser Session)"
+        )
+        session.close()
+        session = None
+    if session is not None:
+        logger.console("Using pre-warmed browser session")
+        session.page.set_default_timeout(default_timeout)
+    else:
+        session = BrowserSession(slow_mo=slow_mo, default_timeout=default_timeout)
+        try:
+            session.open_jira_home(start_path)
+        except Exception:
+            session.close()
+            raise
+
+    try:
+        yield session.page
+    finally:
+        session.save_trace(name)
+        session.close()
+        session.memory.report(name)
+
+
+@library
+class JiraBrowserSession:
+    """
+    Robot library for warming the browser ahead of a UI keyword.
+
+    Start it right after kicking off API fixtures (`Start Create Jira Issue`): Chromium
+    launch, cookie loading and the first Jira navigation then overlap with the REST call.
+    """
+
+    @keyword("Start Browser Session")
+    def start_browser_session(self, slow_mo=100):
+        """Launch the browser and open Jira home; `slow_mo` must match the UI keyword that follows."""
+        global _warm_session
+        if _warm_session is not None:
+            _warm_session.close()
+            _warm_session = None
+
+        session = BrowserSession(slow_mo=int(slow_mo))
+        try:
+            session.open_jira_home()
+        except Exception:
+            session.close()
+            raise
+        _warm_session = session
+
+    @keyword("Close Browser Session")
+    def close_browser_session(self):
+        """Close a warmed session that no UI keyword picked up (safe to call anytime)."""
+        session = _take_warm_session()
+        if session is not None:
+            session.close()
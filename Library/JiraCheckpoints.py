@@ -0,0 +1,103 @@
+import json
+import os
+import re
+import time
+from robot.api import logger
+from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
+
+from JiraConfig import RESULTS_DIR
+from JiraRestClient import search_issues
+from JiraResultFiles import write_json_atomic
+from JiraStepTimeouts import step_timeout
+
+CHECKPOINT_DIR = os.getenv("JIRA_CHECKPOINT_DIR", os.path.join(RESULTS_DIR, "checkpoints"))
+
+
+def current_test_name():
+    try:
+        return BuiltIn().get_variable_value("${TEST NAME}") or "no-test"
+    except RobotNotRunningError:
+        return "no-test"
+
+
+class FlowCheckpoint:
+    """
+    Per-test record of the completed steps of a UI flow, kept on disk so a retried
+    keyword can resume instead of starting over.
+
+    `scope` identifies the fixture the flow works on (e.g. the epic key); a record left
+    behind for another scope belongs to an earlier run and is discarded.
+    """
+
+    def __init__(self, flow, scope):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", current_test_name()).strip("_")
+        self.path = os.path.join(CHECKPOINT_DIR, f"{slug}__{flow}.json")
+        self.flow = flow
+        self.scope = scope
+        self.data = self._load()
+        if self.data.get("scope") != scope:
+            self.data = {"scope": scope, "steps": {}}
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        write_json_atomic(self.path, self.data, indent=1)
+
+    def state(self, step):
+        return self.data["steps"].get(step, {}).get("state")
+
+    def done(self, step):
+        return self.state(step) == "done"
+
+    def value(self, step):
+        return self.data["steps"].get(step, {}).get("value")
+
+    def start(self, step):
+        """Mark a step with server-side effects as begun, before triggering it."""
+        self.data["steps"][step] = {"state": "started", "at": time.time()}
+        self._save()
+
+    def complete(self, step, value=None):
+        self.data["steps"][step] = {"state": "done", "at": time.time(), "value": value}
+        self._save()
+        logger.info(f"[{self.flow}] step '{step}' done")
+
+
+def find_existing_child(parent_key, summary, timeout=60.0, interval=3.0):
+    """
+    Key of an existing child of parent_key with exactly this summary, or None.
+    Polls for up to `timeout` seconds because search indexing can lag a fresh child.
+    """
+    jql = f'parent = {parent_key} AND summary ~ "\\"{summary}\\"" ORDER BY created DESC'
+    deadline = time.time() + timeout
+    while True:
+        for issue in search_issues(jql):
+            if issue["fields"].get("summary") == summary:
+                return issue["key"]
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return None
+        time.sleep(min(interval, remaining))
+
+
+def resume_created_child(checkpoint, step, parent_key, summary, budget_name, cap_ms=60000):
+    """
+    Key of the child an earlier attempt already submitted under `step`, polled for up to
+    the step budget. Fails instead of returning None: re-creating it would risk a duplicate.
+    """
+    with step_timeout(budget_name, cap_ms) as timeout:
+        child_key = find_existing_child(parent_key, summary, timeout=timeout / 1000.0)
+    if not child_key:
+        raise AssertionError(
+            f"[{checkpoint.flow}] '{summary}' was already submitted under {parent_key} but is not "
+            f"searchable after {timeout} ms; not re-creating it to avoid a duplicate"
+        )
+    logger.console(f" Resuming: '{summary}' already exists under {parent_key}: {child_key}")
+    checkpoint.complete(step)
+    checkpoint.complete("extract_key", child_key)
+    return child_key
@@ -0,0 +1,8 @@
+import os
+
+# Shared Jira settings for the Python libraries (mirrors Resources/JiraVariables.robot)
+JIRA_BASE_URL = os.getenv("JIRA_BASE_URL", "https://automationbot999.atlassian.net").rstrip("/")
+PROJECT_KEY = os.getenv("JIRA_PROJECT_KEY", "DEMO")
+
+COOKIE_PATH = os.path.join(os.path.dirname(__file__), "jira_cookies.json")
+RESULTS_DIR = os.getenv("JIRA_RESULTS_DIR", os.path.join(os.path.dirname(__file__), "..", "results"))
@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import threading
+import time
+from robot.api.deco import keyword, library
+from robot.api import logger
+
+from JiraConfig import JIRA_BASE_URL, PROJECT_KEY
+from JiraRestClient import jira_auth, jira_request
+from JiraResultFiles import write_json_atomic
+
+CACHE_PATH = os.getenv(
+    "JIRA_METADATA_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "jira-automation", "jira_metadata.json"),
+)
+CACHE_TTL_SECONDS = int(os.getenv("JIRA_METADATA_TTL", str(24 * 3600)))
+
+
+def _normalize(name):
+    # "Sub-task", "Subtask" and "sub task" all resolve to the same type
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+class MetadataCache:
+    """
+    On-disk cache of Jira REST metadata responses.
+
+    Entries younger than the TTL are served without a request. Older entries are
+    revalidated with If-None-Match when Jira gave an ETag, so an unchanged project
+    costs a 304 instead of a full payload. Keys are scoped to the Jira site and the
+    account, since ids and visible metadata differ between them.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        try:
+            write_json_atomic(self.path, self.entries)
+        except OSError as e:
+            logger.console(f"Warning: could not persist Jira metadata cache: {e}")
+
+    @staticmethod
+    def _scoped(key):
+        return f"{JIRA_BASE_URL} {jira_auth()[0]} {key}"
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(self._scoped(key))
+            if entry and time.time() - entry["fetched_at"] < self.ttl:
+                return entry["body"]
+            return None
+
+    def put(self, key, body, etag=None):
+        with self._lock:
+            self.entries[self._scoped(key)] = {"fetched_at": time.time(), "etag": etag, "body": body}
+            self._save()
+
+    def get_json(self, path):
+        """Cached GET of a Jira REST path, revalidated once the TTL expires."""
+        body = self.get(path)
+        if body is not None:
+            return body
+
+        with self._lock:
+            entry = self.entries.get(self._scoped(path))
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+
+        response = jira_request("GET", path, headers=headers)
+        if response.status_code == 304 and entry:
+            self.put(path, entry["body"], entry.get("etag"))
+            return entry["body"]
+        if response.status_code != 200:
+            raise AssertionError(f"GET {path} returned {response.status_code}: {response.text[:500]}")
+
+        body = response.json()
+        self.put(path, body, response.headers.get("ETag"))
+        return body
+
+
+_cache = None
+
+
+def metadata_cache():
+    global _cache
+    if _cache is None:
+        _cache = MetadataCache()
+    return _cache
+
+
+def issue_types(project_key=PROJECT_KEY):
+    body = metadata_cache().get_json(f"/rest/api/2/issue/createmeta/{project_key}/issuetypes?maxResults=100")
+    return body.get("values", body.get("issueTypes", []))
+
+
+def issue_type(name, project_key=PROJECT_KEY):
+    wanted = _normalize(name)
+    for item in issue_types(project_key):
+        if _normalize(item["name"]) == wanted:
+            return item
+    known = ", ".join(item["name"] for item in issue_types(project_key))
+    raise ValueError(f"Issue type '{name}' not found in project {project_key} (available: {known})")
+
+
+def issue_type_id(name, project_key=PROJECT_KEY):
+    return issue_type(name, project_key)["id"]
+
+
+def create_fields(type_name, project_key=PROJECT_KEY):
+    type_id = issue_type_id(type_name, project_key)
+    body = metadata_cache().get_json(
+        f"/rest/api/2/issue/createmeta/{project_key}/issuetypes/{type_id}?maxResults=200"
+    )
+    return body.get("values", body.get("fields", []))
+
+
+def priority_id(name):
+    for item in metadata_cache().get_json("/rest/api/2/priority"):
+        if _normalize(item["name"]) == _normalize(name):
+            return item["id"]
+    raise ValueError(f"Priority '{name}' not found")
+
+
+def transition_id(name, issue_key, project_key=PROJECT_KEY, issue_type_name=None):
+    """
+    Transition ids depend on the workflow, which Jira assigns per issue type, so they are
+    learned from a sample issue and cached per project and issue type. With the type given,
+    later runs resolve the name without any request.
+    """
+    if issue_type_name is None:
+        response = jira_request("GET", f"/rest/api/2/issue/{issue_key}", expected_status=200,
+                                params={"fields": "issuetype"})
+        issue_type_name = response.json()["fields"]["issuetype"]["name"]
+    cache = metadata_cache()
+    key = f"transitions/{project_key}/{_normalize(issue_type_name)}"
+    known = cache.get(key) or {}
+    if _normalize(name) not in known:
+        response = jira_request("GET", f"/rest/api/2/issue/{issue_key}/transitions", expected_status=200)
+        for item in response.json().get("transitions", []):
+            known[_normalize(item["name"])] = item["id"]
+        cache.put(key, known)
+    if _normalize(name) not in known:
+        raise ValueError(f"Transition '{name}' not available for {issue_key}")
+    return known[_normalize(name)]
+
+
+@library
+class JiraCreateMetadata:
+    """
+    Robot library resolving project metadata (issue type, priority and transition ids,
+    required create fields) from Jira once, cached on disk with TTL/ETag revalidation.
+    Uses the EMAIL/API_TOKEN exported by INITIALIZE SECRETS.
+    """
+
+    @keyword("Get Issue Type Id")
+    def get_issue_type_id(self, issue_type_name, project_key=PROJECT_KEY):
+        return issue_type_id(issue_type_name, project_key)
+
+    @keyword("Get Required Fields")
+    def get_required_fields(self, issue_type_name, project_key=PROJECT_KEY):
+        return [field["fieldId"] for field in create_fields(issue_type_name, project_key) if field.get("required")]
+
+    @keyword("Get Priority Id")
+    def get_priority_id(self, priority_name):
+        return priority_id(priority_name)
+
+    @keyword("Get Transition Id")
+    def get_transition_id(self, transition_name, issue_key, project_key=PROJECT_KEY, issue_type=None):
+        """`issue_type` of `issue_key` is looked up when not given (one extra request)."""
+        return transition_id(transition_name, issue_key, project_key, issue_type)
@@ -0,0 +1,56 @@
+import JiraPlaywright as pw
+
+# Evaluated in the page: returns the first selector (CSS or XPath) with a visible match, else null
+_FIRST_VISIBLE_JS = """
+(selectors) => {
+    const isVisible = (el) => {
+        if (!el || !el.isConnected) return false;
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const matches = (sel) => {
+        if (sel.startsWith('//') || sel.startsWith('(')) {
+            const found = document.evaluate(sel, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let i = 0; i < found.snapshotLength; i++) {
+                if (isVisible(found.snapshotItem(i))) return true;
+            }
+            return false;
+        }
+        return Array.from(document.querySelectorAll(sel)).some(isVisible);
+    };
+    for (const sel of selectors) {
+        try {
+            if (matches(sel)) return sel;
+        } catch (e) {
+            // invalid selector for this document: treat as not matched
+        }
+    }
+    return null;
+}
+"""
+
+
+def probe_selectors(page, selectors):
+    """
+    Check a whole set of selectors in one browser round-trip.
+    Returns the first selector with a visible match, or None.
+    """
+    return page.evaluate(_FIRST_VISIBLE_JS, list(selectors))
+
+
+def wait_for_any_selector(page, selectors, timeout=10000):
+    """
+    Wait until any of the selectors has a visible match and return that selector.
+
+    The check runs inside the page on every animation frame, so it reacts as soon as
+    the condition appears and costs a single driver round-trip. Raises TimeoutError.
+    """
+    try:
+        handle = page.wait_for_function(
+            _FIRST_VISIBLE_JS, arg=list(selectors), polling="raf", timeout=timeout
+        )
+    except pw.TimeoutError:
+        raise pw.TimeoutError(f"None of the selectors became visible within {timeout} ms: {selectors}")
+    return handle.json_value()
@@ -1,8 +1,13 @@
-import os
-import json
 from robot.api.deco import keyword, library
-from playwright.sync_api import sync_playwright, expect, TimeoutError
+import JiraPlaywright as pw
 from robot.api import logger
+from JiraDomProbe import wait_for_any_selector
+from JiraStepTimeouts import step_timeout
+from JiraBrowserSession import jira_page
+from JiraConfig import JIRA_BASE_URL
+from JiraCheckpoints import FlowCheckpoint, resume_created_child
+
+STORY_SUMMARY = "User story created using UI"
 
 
 @library
@@ -14,189 +19,183 @@ class JiraEpicStorySubTaskUIFlow:
     @keyword("Run Epic UI Flow")
     def run_epic_ui_flow(self, epic_key):
         """
-        UI Flow:
-        - Load Jira using stored session cookies
-        - Validate Epic page
-        - Create Story under Epic using inline child work item flow
-        - Return STORY_KEY
+        UI Flow (named steps, checkpointed per test):
+        - open_epic: Load Jira using stored session cookies and validate Epic page
+        - open_panel: Open the inline child work item panel
+        - create_story: Create Story under Epic
+        - extract_key: Return STORY_KEY
+
+        On retry the flow resumes from the first incomplete step: once the story summary
+        was submitted, its key is polled over the API for up to the step budget instead of
+        creating a duplicate, and the retry fails if the story never shows up.
         """
+        checkpoint = FlowCheckpoint("epic_story", scope=epic_key)
+        if checkpoint.done("extract_key"):
+            return checkpoint.value("extract_key")
+
+        if checkpoint.state("create_story"):
+            # The summary was submitted by an earlier attempt; wait for that story, never re-create it
+            return resume_created_child(
+                checkpoint, "create_story", epic_key, STORY_SUMMARY, "epic_story.find_existing"
+            )
 
-        # Load Jira cookies from file
-        cookie_path = os.path.join(os.path.dirname(__file__), "jira_cookies.json")
-        if not os.path.exists(cookie_path):
-            raise FileNotFoundError("jira_cookies.json not found in Library folder")
+        # Start Playwright (or pick up a pre-warmed session) with cookies loaded and Jira open
+        with jira_page("Run Epic UI Flow", slow_mo=100, default_timeout=60000) as page:
+            self._open_epic(page, epic_key)
+            checkpoint.complete("open_epic")
 
-        with open(cookie_path, "r", encoding="utf-8") as f:
-            cookies = json.load(f)
+            self._open_inline_panel(page)
+            checkpoint.complete("open_panel")
 
-        # Start Playwright
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, slow_mo=100)
+            self._create_story(page, checkpoint)
+            checkpoint.complete("create_story")
 
-            # Create clean browser context
-            context = browser.new_context()
+            story_key = self._extract_story_key(page)
+            checkpoint.complete("extract_key", story_key)
 
-            # FIX: Always clear old cookies
-            context.clear_cookies()
+            return story_key
 
-            # FIX: Load cookies safely
+    # ================================
+    # Step: Open Project and Epic Page
+    # ================================
+    def _open_epic(self, page, epic_key):
+        logger.console("Opening demo project...")
+
+        try:
+            project = page.locator("a[href*='/browse/DEMO']").first
+            with step_timeout("epic_story.project_link", 25000) as timeout:
+                project.wait_for(state="visible", timeout=timeout)
+            project.click()
+            page.wait_for_timeout(1500)
+        except pw.TimeoutError:
+            logger.console("Project link not detected — navigating directly to epic")
+
+        # ================================
+        # Open Epic Page
+        # ================================
+        logger.console(f"Opening Epic → {epic_key}")
+        page.goto(f"{JIRA_BASE_URL}/browse/{epic_key}",
+                  wait_until="domcontentloaded")
+
+        breadcrumb = page.get_by_test_id(
+            "issue.views.issue-base.foundation.breadcrumbs.current-issue.item"
+        ).locator("span")
+
+        with step_timeout("epic_story.epic_breadcrumb", 25000) as timeout:
+            breadcrumb.wait_for(state="visible", timeout=timeout)
+        pw.expect(breadcrumb).to_contain_text(epic_key)
+        logger.console(f" Epic {epic_key} is visible on UI")
+
+    # ================================
+    # Step: open inline child work item panel
+    # ================================
+    def _open_inline_panel(self, page):
+        logger.console("Creating Story under Epic...")
+
+        # ---------- DOCKER-SAFE LOCATOR BLOCK ----------
+        for attempt in range(5):
             try:
-                context.add_cookies(cookies)
-            except Exception as e:
-                logger.console(f" Cookie load issue: {e}")
-                logger.console("Proceeding without valid cookies...")
-
-            page = context.new_page()
+                add_child_btn = page.locator(
+                    "//span[text()='Add child work item']/ancestor::button"
+                )
 
-            # FIX: Increased timeout to 60 seconds for Docker
-            page.set_default_timeout(60000)
+                page.wait_for_load_state("domcontentloaded")
+                page.wait_for_timeout(500)
 
-            logger.console("Navigating to Jira...")
+                with step_timeout("epic_story.add_child_button", 10000) as timeout:
+                    add_child_btn.wait_for(state="visible", timeout=timeout)
 
-            # ----- FIRST ATTEMPT -----
-            try:
-                page.goto("https://automationbot999.atlassian.net",
-                          wait_until="domcontentloaded")
+                # JS scroll — always reliable in headless Docker
+                page.evaluate("el => el.scrollIntoView()", add_child_btn.element_handle())
+                page.wait_for_timeout(300)
 
-                if "login" in page.url:
-                    raise TimeoutError("Session expired → login required")
+                add_child_btn.hover()
+                page.wait_for_timeout(300)
 
-            except TimeoutError:
-                logger.console("Cookie session expired — retrying with login page")
-                page.goto("https://id.atlassian.com/login", wait_until="domcontentloaded")
-                raise
+                #logger.console("Add child work item button ready")
+                break
 
-            # ================================
-            # Open Project
-            # ================================
-            logger.console("Opening demo project...")
+            except Exception:
+                logger.console(f"Retry {attempt+1}/5 — element unstable, retrying...")
+                page.wait_for_timeout(700)
+        else:
+            raise pw.TimeoutError(" Add child work item button never stabilized in DOM")
+        # --------------------------------------------------
 
+        # Try clicking 3 different ways
+        clicked = False
+        for method in ["click", "dblclick", "click(force=True)"]:
             try:
-                project = page.locator("a[href*='/browse/DEMO']").first
-                project.wait_for(state="visible", timeout=25000)
-                project.click()
-                page.wait_for_timeout(1500)
-            except TimeoutError:
-                logger.console("Project link not detected — navigating directly to epic")
-
-            # ================================
-            # Open Epic Page
-            # ================================
-            logger.console(f"Opening Epic → {epic_key}")
-            page.goto(f"https://automationbot999.atlassian.net/browse/{epic_key}",
-                      wait_until="domcontentloaded")
-
-            breadcrumb = page.get_by_test_id(
-                "issue.views.issue-base.foundation.breadcrumbs.current-issue.item"
-            ).locator("span")
-
-            breadcrumb.wait_for(state="visible", timeout=25000)
-            expect(breadcrumb).to_contain_text(epic_key)
-            logger.console(f" Epic {epic_key} is visible on UI")
-
-            # ================================
-            # Create Story under Epic
-            # ================================
-            logger.console("Creating Story under Epic...")
-
-            # ---------- DOCKER-SAFE LOCATOR BLOCK ----------
-            for attempt in range(5):
-                try:
-                    add_child_btn = page.locator(
-                        "//span[text()='Add child work item']/ancestor::button"
-                    )
-
-                    page.wait_for_load_state("domcontentloaded")
-                    page.wait_for_timeout(500)
-
-                    add_child_btn.wait_for(state="visible", timeout=10000)
-
-                    # JS scroll — always reliable in headless Docker
-                    page.evaluate("el => el.scrollIntoView()", add_child_btn.element_handle())
-                    page.wait_for_timeout(300)
-
-                    add_child_btn.hover()
-                    page.wait_for_timeout(300)
-
-                    #logger.console("Add child work item button ready")
-                    break
-
-                except Exception:
-                    logger.console(f"Retry {attempt+1}/5 — element unstable, retrying...")
-                    page.wait_for_timeout(700)
-            else:
-                raise TimeoutError(" Add child work item button never stabilized in DOM")
-            # --------------------------------------------------
-
-            # Try clicking 3 different ways
-            clicked = False
-            for method in ["click", "dblclick", "click(force=True)"]:
-                try:
-                    if method == "click":
-                        add_child_btn.click()
-                    elif method == "dblclick":
-                        add_child_btn.dblclick()
-                    else:
-                        add_child_btn.click(force=True)
-
-                    page.wait_for_timeout(800)
-
-                    panel_open = (
-                        page.locator(
-                            "//input[@data-testid='issue-view-common-views.child-issues-panel.inline-create.summary-textfield']"
-                        ).is_visible()
-                        or page.locator("button[aria-label='Select work type']").is_visible()
-                        or page.locator("//button[contains(.,'Cancel')]").is_visible()
-                    )
-
-                    if panel_open:
-                        clicked = True
-                        break
-
-                except Exception:
-                    pass
-
-            if not clicked:
-                raise TimeoutError("Failed to open 'Add child work item' panel")
-
-            # Open Type dropdown
-            work_type_btn = page.locator("button[aria-label='Select work type']").first
-            work_type_btn.wait_for(state="visible", timeout=15000)
-            work_type_btn.click()
-
-            # Select STORY
-            story_option = page.locator(
-                "//div[@role='group']//button[.//span[contains(.,'Story')]]"
-            ).first
-
-            story_option.wait_for(state="visible", timeout=10000)
-            story_option.click()
-
-            # Enter summary
-            summary_input = page.locator(
-                "//input[@data-testid='issue-view-common-views.child-issues-panel.inline-create.summary-textfield']"
-            )
-            summary_input.wait_for(state="visible", timeout=15000)
-            summary_input.fill("User story created using UI")
-            summary_input.press("Enter")
-
-            # Extract story key
-            summary_text = "User story created using UI"
-
-            story_row = page.locator(
-                "//tr[@data-testid='native-issue-table.ui.issue-row']"
-                f"[.//a[contains(text(), '{summary_text}')]]"
-            )
-            story_row.wait_for(state="visible", timeout=25000)
-
-            story_key_el = story_row.locator(
-                "a[data-testid='native-issue-table.common.ui.issue-cells.issue-key.issue-key-cell']"
-            )
-            story_key_el.wait_for(state="visible", timeout=25000)
-
-            story_key = story_key_el.inner_text().strip()
-
-            context.close()
-            browser.close()
-
-            return story_key
+                if method == "click":
+                    add_child_btn.click()
+                elif method == "dblclick":
+                    add_child_btn.dblclick()
+                else:
+                    add_child_btn.click(force=True)
+
+                # One round-trip for all panel indicators; returns as soon as one shows
+                wait_for_any_selector(page, [
+                    "//input[@data-testid='issue-view-common-views.child-issues-panel.inline-create.summary-textfield']",
+                    "button[aria-label='Select work type']",
+                    "//button[contains(.,'Cancel')]",
+                ], timeout=800)
+
+                clicked = True
+                break
+
+            except Exception:
+                pass
+
+        if not clicked:
+            raise pw.TimeoutError("Failed to open 'Add child work item' panel")
+
+    # ================================
+    # Step: select Story type and submit summary
+    # ================================
+    def _create_story(self, page, checkpoint):
+        # Open Type dropdown
+        work_type_btn = page.locator("button[aria-label='Select work type']").first
+        with step_timeout("epic_story.work_type_button", 15000) as timeout:
+            work_type_btn.wait_for(state="visible", timeout=timeout)
+        work_type_btn.click()
+
+        # Select STORY
+        story_option = page.locator(
+            "//div[@role='group']//button[.//span[contains(.,'Story')]]"
+        ).first
+
+        with step_timeout("epic_story.story_option", 10000) as timeout:
+            story_option.wait_for(state="visible", timeout=timeout)
+        story_option.click()
+
+        # Enter summary
+        summary_input = page.locator(
+            "//input[@data-testid='issue-view-common-views.child-issues-panel.inline-create.summary-textfield']"
+        )
+        with step_timeout("epic_story.summary_input", 15000) as timeout:
+            summary_input.wait_for(state="visible", timeout=timeout)
+        # From here on Jira may create the story, so a retry must not submit it again
+        checkpoint.start("create_story")
+        summary_input.fill(STORY_SUMMARY)
+        summary_input.press("Enter")
+
+    # ================================
+    # Step: Extract story key
+    # ================================
+    def _extract_story_key(self, page):
+        story_row = page.locator(
+            "//tr[@data-testid='native-issue-table.ui.issue-row']"
+            f"[.//a[contains(text(), '{STORY_SUMMARY}')]]"
+        )
+        with step_timeout("epic_story.story_row", 25000) as timeout:
+            story_row.wait_for(state="visible", timeout=timeout)
+
+        story_key_el = story_row.locator(
+            "a[data-testid='native-issue-table.common.ui.issue-cells.issue-key.issue-key-cell']"
+        )
+        with step_timeout("epic_story.story_key", 25000) as timeout:
+            story_key_el.wait_for(state="visible", timeout=timeout)
+
+        story_key = story_key_el.inner_text().strip()
+        logger.console(f" Story created via UI: {story_key}")
+        return story_key
@@ -1,9 +1,14 @@
-import os
-import json
 from robot.api.deco import keyword, library
-from playwright.sync_api import sync_playwright, expect, TimeoutError
+import JiraPlaywright as pw
 from robot.api import logger
 import time
+from JiraDomProbe import wait_for_any_selector
+from JiraStepTimeouts import step_timeout
+from JiraBrowserSession import jira_page
+from JiraConfig import JIRA_BASE_URL
+from JiraCheckpoints import FlowCheckpoint, resume_created_child
+
+TASK_SUMMARY = "Task created using UI"
 
 
 @library
@@ -15,281 +20,227 @@ class JiraEpicTaskUIFlow:
     @keyword("Run Epic Task UI Flow")
     def run_epic_task_ui_flow(self, epic_key):
         """
-        UI Flow:
-        - Load Jira using stored session cookies
-        - Navigate to Epic
-        - Create Task under Epic using inline child work item panel
-        - Return TASK_KEY
+        UI Flow (named steps, checkpointed per test):
+        - open_epic: Load Jira using stored session cookies and navigate to Epic
+        - open_panel: Open the inline child work item panel
+        - create_task: Create Task under Epic
+        - extract_key: Return TASK_KEY
+
+        On retry the flow resumes from the first incomplete step: once the task summary
+        was submitted, its key is polled over the API for up to the step budget instead of
+        creating a duplicate, and the retry fails if the task never shows up.
         """
+        checkpoint = FlowCheckpoint("epic_task", scope=epic_key)
+        if checkpoint.done("extract_key"):
+            return checkpoint.value("extract_key")
+
+        if checkpoint.state("create_task"):
+            # The summary was submitted by an earlier attempt; wait for that task, never re-create it
+            return resume_created_child(
+                checkpoint, "create_task", epic_key, TASK_SUMMARY, "epic_task.find_existing"
+            )
 
-        # Load Jira cookies
-        cookie_path = os.path.join(os.path.dirname(__file__), "jira_cookies.json")
-        if not os.path.exists(cookie_path):
-            raise FileNotFoundError("jira_cookies.json not found in Library folder")
+        # Start Playwright (or pick up a pre-warmed session) with cookies loaded and Jira open
+        with jira_page("Run Epic Task UI Flow", slow_mo=60, default_timeout=60000) as page:
+            self._open_epic(page, epic_key)
+            checkpoint.complete("open_epic")
 
-        with open(cookie_path, "r", encoding="utf-8") as f:
-            cookies = json.load(f)
+            self._open_inline_panel(page)
+            checkpoint.complete("open_panel")
 
-        # Start Playwright
-        with sync_playwright() as p:
-            # headless True recommended for container runs
-            browser = p.chromium.launch(headless=True, slow_mo=60)
+            self._create_task(page, checkpoint)
+            checkpoint.complete("create_task")
 
-            # Fresh browser context
-            context = browser.new_context()
+            task_key = self._extract_task_key(page)
+            checkpoint.complete("extract_key", task_key)
 
-            # Always clear old cookies
-            try:
-                context.clear_cookies()
-            except Exception:
-                # not fatal; log and continue
-                logger.console("Warning: context.clear_cookies() failed, continuing")
+            return task_key
 
-            # Safe cookie loading
+    # ================================
+    # Step: Open Epic Page
+    # ================================
+    def _open_epic(self, page, epic_key):
+        logger.console(f"Opening Epic → {epic_key}")
+        page.goto(f"{JIRA_BASE_URL}/browse/{epic_key}", wait_until="domcontentloaded")
+
+        # Validate epic page
+        breadcrumb = page.get_by_test_id(
+            "issue.views.issue-base.foundation.breadcrumbs.current-issue.item"
+        ).locator("span")
+
+        with step_timeout("epic_task.epic_breadcrumb", 30000) as timeout:
+            breadcrumb.wait_for(state="visible", timeout=timeout)
+        pw.expect(breadcrumb).to_contain_text(epic_key)
+        logger.console(f" Epic {epic_key} is visible on UI")
+
+    # ================================
+    # Helper: robust click on locator with retries and JS fallback
+    # ================================
+    def _robust_click_locator(self, page, get_locator_func, timeout=30000):
+        """
+        get_locator_func: callable returning a locator when called.
+        Tries multiple click strategies and re-queries locator each try.
+        """
+        start = time.time()
+        last_err = None
+        while time.time() - start < (timeout / 1000.0):
             try:
-                context.add_cookies(cookies)
-            except Exception as e:
+                loc = get_locator_func()
+                # ensure visible & attached
+                loc.wait_for(state="visible", timeout=5000)
+                # try normal click first
                 try:
-                    context.add_cookies([c for c in cookies])
-                except Exception as e2:
-                    logger.console(f"Cookie load issue: {e} / {e2}")
-                    logger.console("Proceeding without valid cookies...")
-
-            page = context.new_page()
-
-            # Increase timeout globally for slow CI/container environments
-            page.set_default_timeout(60000)
-
-            logger.console("Navigating to Jira...")
-
-            # ----- FIRST ATTEMPT -----
-            try:
-                page.goto("https://automationbot999.atlassian.net", wait_until="domcontentloaded")
-                # If Atlassian redirected to login, treat as expired cookie
-                if "login" in page.url.lower():
-                    logger.console("Invalid/expired session detected → redirected to login")
-                    raise TimeoutError("Session expired")
-            except TimeoutError:
-                logger.console("Cookie session expired — navigating to login page to surface issue")
+                    loc.scroll_into_view_if_needed()
+                    loc.click()
+                    return True
+                except Exception as e_click:
+                    last_err = e_click
+                # try dblclick
                 try:
-                    page.goto("https://id.atlassian.com/login", wait_until="domcontentloaded")
+                    loc.dblclick()
+                    return True
                 except Exception:
-                    # ignore further errors here; raising to indicate session/login required
                     pass
-                raise
-
-            # ================================
-            # Open Epic Page
-            # ================================
-            logger.console(f"Opening Epic → {epic_key}")
-            page.goto(f"https://automationbot999.atlassian.net/browse/{epic_key}", wait_until="domcontentloaded")
-
-            # Validate epic page
-            breadcrumb = page.get_by_test_id(
-                "issue.views.issue-base.foundation.breadcrumbs.current-issue.item"
-            ).locator("span")
-
-            breadcrumb.wait_for(state="visible", timeout=30000)
-            expect(breadcrumb).to_contain_text(epic_key)
-            logger.console(f" Epic {epic_key} is visible on UI")
-
-            # ================================
-            # Helper: robust click on locator with retries and JS fallback
-            # ================================
-            def robust_click_locator(get_locator_func, timeout=30000):
-                """
-                get_locator_func: callable returning a locator when called.
-                Tries multiple click strategies and re-queries locator each try.
-                """
-                start = time.time()
-                last_err = None
-                while time.time() - start < (timeout / 1000.0):
-                    try:
-                        loc = get_locator_func()
-                        # ensure visible & attached
-                        loc.wait_for(state="visible", timeout=5000)
-                        # try normal click first
-                        try:
-                            loc.scroll_into_view_if_needed()
-                            loc.click()
-                            return True
-                        except Exception as e_click:
-                            last_err = e_click
-                        # try dblclick
-                        try:
-                            loc.dblclick()
-                            return True
-                        except Exception:
-                            pass
-                        # try force click
-                        try:
-                            loc.click(force=True)
-                            return True
-                        except Exception:
-                            pass
-                        # try JS click on element handle
-                        try:
-                            handle = loc.element_handle(timeout=2000)
-                            if handle:
-                                page.evaluate("el => el.click()", handle)
-                                return True
-                        except Exception:
-                            pass
-                    except Exception as e:
-                        last_err = e
-
-                    # small backoff and then re-query
-                    time.sleep(0.6)
-
-                # final attempt: log and raise
-                logger.console(f"robust_click_locator exhausted; last error: {last_err}")
-                return False
-
-            # ================================
-            # Helper: open inline panel (robust)
-            # ================================
-            def open_inline_panel():
-                """
-                Attempts to open the Add child work item inline panel using multiple techniques.
-                Re-queries locator on every attempt to avoid 'element not attached' problems.
-                """
-                # define how to get locator (re-query each time)
-                def get_add_btn():
-                    return page.locator("//span[text()='Add child work item']/ancestor::button").first
-
-                # Try clicking the add button robustly
-                clicked = robust_click_locator(get_add_btn, timeout=30000)
-                if not clicked:
-                    # As extra fallback: try opening the "Create child" via alternate selector (icon-button)
-                    def get_add_btn_alt():
-                        return page.get_by_test_id("issue-view-common-views.button.icon-button.Create child")
-                    clicked_alt = robust_click_locator(get_add_btn_alt, timeout=10000)
-                    if not clicked_alt:
-                        raise TimeoutError("Failed to open inline 'Add child work item' panel")
-
-                # wait briefly for panel to appear
-                time.sleep(0.6)
-
-                # confirm panel presence via multiple indicators
-                panel_indicators = [
-                    "//input[@data-testid='issue-view-common-views.child-issues-panel.inline-create.summary-textfield']",
-                    "button[aria-label='Select work type']",
-                    "//button[contains(.,'Cancel')]"
-                ]
-
-                # wait loop for one of indicators
-                start = time.time()
-                while time.time() - start < 20:
-                    try:
-                        for sel in panel_indicators:
-                            try:
-                                if sel.startswith("//"):
-                                    if page.locator(sel).is_visible():
-                                        return True
-                                else:
-                                    if page.locator(sel).is_visible():
-                                        return True
-                            except Exception:
-                                continue
-                    except Exception:
-                        pass
-                    time.sleep(0.5)
-
-                # last resort: try clicking Add again and then fail
-                logger.console("Panel indicators not detected after initial click; retrying Add button once more")
-                if not robust_click_locator(get_add_btn, timeout=8000):
-                    raise TimeoutError("Failed to open inline 'Add child work item' panel after retries")
-
-                # final wait
-                time.sleep(0.8)
-                # re-check indicators
-                for sel in panel_indicators:
-                    try:
-                        if sel.startswith("//"):
-                            if page.locator(sel).is_visible():
-                                return True
-                        else:
-                            if page.locator(sel).is_visible():
-                                return True
-                    except Exception:
-                        continue
-
-                # give up
-                raise TimeoutError("Failed to open inline 'Add child work item' panel")
-
-            # ================================
-            # Opening inline Task creation panel
-            # ================================
-            open_inline_panel()
-
-            # If work type selector appears, choose Task
-            try:
-                work_type_btn = page.locator("button[aria-label='Select work type']").first
-                if work_type_btn.is_visible():
-                    work_type_btn.click()
-                    task_btn = page.locator("//div[@role='group']//button[.//span[contains(.,'Task')]]").first
-                    task_btn.wait_for(state="visible", timeout=15000)
-                    task_btn.click()
-                    logger.console(" Task work type selected")
-                else:
-                    logger.console(" Task selected automatically by default")
-            except Exception:
-                # If anything goes wrong selecting work type, continue if the summary input is visible
-                logger.console("Work-type selection encountered an error; continuing if summary input is present")
-
-            # ================================
-            # Fill Task Summary
-            # ================================
-            task_summary = "Task created using UI"
-
-            task_input = page.locator(
-                "//input[@data-testid='issue-view-common-views.child-issues-panel.inline-create.summary-textfield']"
-            )
-            task_input.wait_for(state="visible", timeout=15000)
-            try:
-                task_input.fill(task_summary)
-                task_input.press("Enter")
-            except Exception:
-                # fallback: use JS to set value and dispatch Enter
+                # try force click
+                try:
+                    loc.click(force=True)
+                    return True
+                except Exception:
+                    pass
+                # try JS click on element handle
                 try:
-                    handle = task_input.element_handle(timeout=2000)
+                    handle = loc.element_handle(timeout=2000)
                     if handle:
-                        page.evaluate(
-                            "(el, val) => { el.focus(); el.value = val; el.dispatchEvent(new Event('input',{bubbles:true})); }",
-                            handle,
-                            task_summary,
-                        )
-                        page.keyboard.press("Enter")
-                except Exception as e:
-                    logger.console(f"Failed to fill summary via fallback: {e}")
-                    raise
-
-            # ================================
-            # Extract Task Key
-            # ================================
-            task_row = page.locator(
-                "//tr[@data-testid='native-issue-table.ui.issue-row']"
-                "[.//a[contains(text(), 'Task created using UI')]]"
-            )
-
-            task_row.wait_for(state="visible", timeout=25000)
+                        page.evaluate("el => el.click()", handle)
+                        return True
+                except Exception:
+                    pass
+            except Exception as e:
+                last_err = e
 
-            task_key_el = task_row.locator(
-                "a[data-testid='native-issue-table.common.ui.issue-cells.issue-key.issue-key-cell']"
-            )
-            task_key_el.wait_for(state="visible", timeout=10000)
-            task_key = task_key_el.inner_text().strip()
+            # small backoff and then re-query
+            time.sleep(0.6)
 
-            logger.console(f" Task created via UI: {task_key}")
+        # final attempt: log and raise
+        logger.console(f"robust_click_locator exhausted; last error: {last_err}")
+        return False
 
-            # Cleanup
-            try:
-                context.close()
-            except Exception:
-                pass
+    # ================================
+    # Step: open inline panel (robust)
+    # ================================
+    def _open_inline_panel(self, page):
+        """
+        Attempts to open the Add child work item inline panel using multiple techniques.
+        Re-queries locator on every attempt to avoid 'element not attached' problems.
+        """
+        # define how to get locator (re-query each time)
+        def get_add_btn():
+            return page.locator("//span[text()='Add child work item']/ancestor::button").first
+
+        # Try clicking the add button robustly
+        clicked = self._robust_click_locator(page, get_add_btn, timeout=30000)
+        if not clicked:
+            # As extra fallback: try opening the "Create child" via alternate selector (icon-button)
+            def get_add_btn_alt():
+                return page.get_by_test_id("issue-view-common-views.button.icon-button.Create child")
+            clicked_alt = self._robust_click_locator(page, get_add_btn_alt, timeout=10000)
+            if not clicked_alt:
+                raise pw.TimeoutError("Failed to open inline 'Add child work item' panel")
+
+        # confirm panel presence via multiple indicators
+        panel_indicators = [
+            "//input[@data-testid='issue-view-common-views.child-issues-panel.inline-create.summary-textfield']",
+            "button[aria-label='Select work type']",
+            "//button[contains(.,'Cancel')]"
+        ]
+
+        # wait for any indicator in one round-trip
+        try:
+            with step_timeout("epic_task.inline_panel", 20000) as timeout:
+                matched = wait_for_any_selector(page, panel_indicators, timeout=timeout)
+            logger.console(f"Inline panel detected via: {matched}")
+            return True
+        except pw.TimeoutError:
+            pass
+
+        # last resort: try clicking Add again and then fail
+        logger.console("Panel indicators not detected after initial click; retrying Add button once more")
+        if not self._robust_click_locator(page, get_add_btn, timeout=8000):
+            raise pw.TimeoutError("Failed to open inline 'Add child work item' panel after retries")
+
+        # re-check indicators
+        try:
+            wait_for_any_selector(page, panel_indicators, timeout=800)
+            return True
+        except pw.TimeoutError:
+            pass
+
+        # give up
+        raise pw.TimeoutError("Failed to open inline 'Add child work item' panel")
+
+    # ================================
+    # Step: select Task type and submit summary
+    # ================================
+    def _create_task(self, page, checkpoint):
+        # If work type selector appears, choose Task
+        try:
+            work_type_btn = page.locator("button[aria-label='Select work type']").first
+            if work_type_btn.is_visible():
+                work_type_btn.click()
+                task_btn = page.locator("//div[@role='group']//button[.//span[contains(.,'Task')]]").first
+                with step_timeout("epic_task.task_option", 15000) as timeout:
+                    task_btn.wait_for(state="visible", timeout=timeout)
+                task_btn.click()
+                logger.console(" Task work type selected")
+            else:
+                logger.console(" Task selected automatically by default")
+        except Exception:
+            # If anything goes wrong selecting work type, continue if the summary input is visible
+            logger.console("Work-type selection encountered an error; continuing if summary input is present")
+
+        task_input = page.locator(
+            "//input[@data-testid='issue-view-common-views.child-issues-panel.inline-create.summary-textfield']"
+        )
+        with step_timeout("epic_task.summary_input", 15000) as timeout:
+            task_input.wait_for(state="visible", timeout=timeout)
+        # From here on Jira may create the task, so a retry must not submit it again
+        checkpoint.start("create_task")
+        try:
+            task_input.fill(TASK_SUMMARY)
+            task_input.press("Enter")
+        except Exception:
+            # fallback: use JS to set value and dispatch Enter
             try:
-                browser.close()
-            except Exception:
-                pass
+                handle = task_input.element_handle(timeout=2000)
+                if handle:
+                    page.evaluate(
+                        "(el, val) => { el.focus(); el.value = val; el.dispatchEvent(new Event('input',{bubbles:true})); }",
+                        handle,
+                        TASK_SUMMARY,
+                    )
+                    page.keyboard.press("Enter")
+            except Exception as e:
+                logger.console(f"Failed to fill summary via fallback: {e}")
+                raise
 
-            return task_key
+    # ================================
+    # Step: Extract Task Key
+    # ================================
+    def _extract_task_key(self, page):
+        task_row = page.locator(
+            "//tr[@data-testid='native-issue-table.ui.issue-row']"
+            f"[.//a[contains(text(), '{TASK_SUMMARY}')]]"
+        )
+
+        with step_timeout("epic_task.task_row", 25000) as timeout:
+            task_row.wait_for(state="visible", timeout=timeout)
+
+        task_key_el = task_row.locator(
+            "a[data-testid='native-issue-table.common.ui.issue-cells.issue-key.issue-key-cell']"
+        )
+        with step_timeout("epic_task.task_key", 10000) as timeout:
+            task_key_el.wait_for(state="visible", timeout=timeout)
+        task_key = task_key_el.inner_text().strip()
+
+        logger.console(f" Task created via UI: {task_key}")
+        return task_key
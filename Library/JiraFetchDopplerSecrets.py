@@ -1,27 +1,47 @@
 from robot.api.deco import keyword
-import os, json, subprocess
+import os
+import requests
 from dotenv import load_dotenv
 from robot.libraries.BuiltIn import BuiltIn
 
-class JiraFetchDopplerSecrets:
+DOPPLER_URL = "https://api.doppler.com/v3/configs/config/secrets/download?format=json"
+DEFAULT_ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
 
-    @keyword("INITIALIZE SECRETS")
-    def initialize_secrets(self):
-        load_dotenv()
-        token = os.getenv("JIRA_TOKEN")
-        if not token:
-            raise ValueError("JIRA_TOKEN is not set")
+# Secrets are fetched once per process and reused by later INITIALIZE SECRETS calls
+_secrets = None
+
+
+def fetch_secrets():
+    """
+    Load .env and download the Doppler secrets in-process.
+    ENV_FILE_PATH wins when it points at an existing file; otherwise Library/.env is used.
+    """
+    global _secrets
+    if _secrets is not None:
+        return _secrets
 
-        result = subprocess.run([
-            "curl", "-s",
-            "-H", f"Authorization: Bearer {token}",
-            "https://api.doppler.com/v3/configs/config/secrets/download?format=json"
-        ], capture_output=True, text=True)
+    env_file = os.getenv("ENV_FILE_PATH")
+    if not env_file or not os.path.isfile(env_file):
+        env_file = DEFAULT_ENV_FILE
+    load_dotenv(env_file)
+    token = os.getenv("JIRA_TOKEN")
+    if not token:
+        raise ValueError("JIRA_TOKEN is not set")
 
-        if result.returncode != 0 or not result.stdout:
-            raise RuntimeError("Failed to fetch secrets from Doppler")
+    try:
+        response = requests.get(DOPPLER_URL, headers={"Authorization": f"Bearer {token}"}, timeout=30)
+        response.raise_for_status()
+        _secrets = response.json()
+    except (requests.RequestException, ValueError) as e:
+        raise RuntimeError(f"Failed to fetch secrets from Doppler: {e}")
+    return _secrets
 
-        secrets = json.loads(result.stdout)
+
+class JiraFetchDopplerSecrets:
+
+    @keyword("INITIALIZE SECRETS")
+    def initialize_secrets(self):
+        secrets = fetch_secrets()
         username_email = secrets.get("USERNAME", "").strip()
         password_token = secrets.get("PASSWORD", "").strip()
         password_ui = secrets.get("UIPASSWORD", "").strip()
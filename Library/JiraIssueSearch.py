@@ -0,0 +1,77 @@
+import time
+import uuid
+from urllib.parse import quote
+import JiraPlaywright as pw
+from robot.api import logger
+
+from JiraConfig import JIRA_BASE_URL, PROJECT_KEY
+
+# Issue navigator rows (same table component as the child issues panel)
+ISSUE_ROW = "//tr[@data-testid='native-issue-table.ui.issue-row']"
+ISSUE_KEY_CELL = "a[data-testid='native-issue-table.common.ui.issue-cells.issue-key.issue-key-cell']"
+
+
+def run_unique_token():
+    """Short token that makes a summary searchable for exactly one run."""
+    return f"run{uuid.uuid4().hex[:10]}"
+
+
+def jql_string(value):
+    """Quote a value for use inside a JQL clause."""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def issue_search_url(jql):
+    return f"{JIRA_BASE_URL}/issues/?jql={quote(jql)}"
+
+
+def key_jql(issue_key):
+    return f"key = {issue_key}"
+
+
+def summary_jql(summary_text, project_key=PROJECT_KEY):
+    return f"project = {project_key} AND summary ~ {jql_string(summary_text)} ORDER BY created DESC"
+
+
+def open_filtered_issue_rows(page, jql, timeout=30000, poll_interval=3000):
+    """
+    Open the issue navigator pre-filtered by JQL and return the matching rows locator.
+
+    Only the handful of matching rows render, so the lookup cost does not depend on
+    how many issues the project holds. Search indexing can lag a freshly created
+    issue by a few seconds, so the filtered view is reloaded until a row appears.
+    """
+    url = issue_search_url(jql)
+    rows = page.locator(ISSUE_ROW)
+    deadline = time.time() + timeout / 1000.0
+
+    def remaining_ms():
+        # Navigation, reloads and waits all share the one lookup budget
+        return max(1, int((deadline - time.time()) * 1000))
+
+    page.goto(url, wait_until="domcontentloaded", timeout=remaining_ms())
+    while True:
+        try:
+            rows.first.wait_for(state="visible", timeout=min(poll_interval, remaining_ms()))
+            return rows
+        except pw.TimeoutError:
+            if time.time() >= deadline:
+                raise pw.TimeoutError(f"No issue matched '{jql}' within {timeout} ms")
+            logger.console(f"No match yet for '{jql}', reloading filtered view...")
+            page.reload(wait_until="domcontentloaded", timeout=remaining_ms())
+
+
+def find_issue_key_by_summary(page, summary_text, timeout=30000):
+    """Return the key of the newest issue whose summary matches the run-unique text."""
+    rows = open_filtered_issue_rows(page, summary_jql(summary_text), timeout=timeout)
+    key_cell = rows.first.locator(ISSUE_KEY_CELL)
+    key_cell.wait_for(state="visible", timeout=10000)
+    return key_cell.inner_text().strip()
+
+
+def find_issue_link_by_key(page, issue_key, timeout=30000):
+    """Return the key link of exactly one issue, opened through a key-filtered view."""
+    rows = open_filtered_issue_rows(page, key_jql(issue_key), timeout=timeout)
+    key_cell = rows.locator(ISSUE_KEY_CELL).filter(has_text=issue_key).first
+    key_cell.wait_for(state="visible", timeout=10000)
+    return key_cell
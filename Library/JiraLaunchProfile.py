@@ -0,0 +1,42 @@
+import os
+
+# Lean profile for headless container runs; JIRA_BROWSER_LEAN=0 falls back to Playwright defaults
+LEAN = os.getenv("JIRA_BROWSER_LEAN", "1") != "0"
+
+# Only flags Playwright does not already pass (see its chromiumSwitches.js). Playwright owns
+# --disable-features; a second copy would replace its list, so none is added here.
+CHROMIUM_ARGS = [
+    # Nothing in the flows needs GPU or compositor acceleration
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    # Background services Playwright leaves on
+    "--disable-sync",
+    "--disable-domain-reliability",
+    # Fewer renderer processes per page -> lower RSS per flow
+    "--disable-site-isolation-trials",
+]
+
+
+def _viewport():
+    # Width stays at Playwright's 1280 so Jira keeps its desktop issue layout; only the height shrinks
+    width, _, height = os.getenv("JIRA_BROWSER_VIEWPORT", "1280x600").partition("x")
+    return {"width": int(width), "height": int(height)}
+
+
+def launch_args():
+    """Chromium command-line args for chromium.launch(args=...)."""
+    if not LEAN:
+        return []
+    extra = os.getenv("JIRA_CHROMIUM_EXTRA_ARGS", "").split()
+    return CHROMIUM_ARGS + extra
+
+
+def context_options():
+    """Keyword args for browser.new_context(): shorter viewport, no animations."""
+    if not LEAN:
+        return {}
+    return {
+        "viewport": _viewport(),
+        "device_scale_factor": 1,
+        "reduced_motion": "reduce",
+    }
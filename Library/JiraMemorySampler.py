@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from robot.api import logger
+
+from JiraConfig import RESULTS_DIR
+from JiraResultFiles import append_csv_row
+
+ENABLED = os.getenv("JIRA_MEMORY_SAMPLING", "1") != "0"
+INTERVAL_SECONDS = float(os.getenv("JIRA_MEMORY_SAMPLE_INTERVAL", "0.5"))
+REPORT_PATH = os.getenv("JIRA_MEMORY_REPORT", os.path.join(RESULTS_DIR, "memory_profile.csv"))
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _proc_table():
+    """{pid: (ppid, name)} for every process visible in /proc."""
+    table = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # comm may contain spaces; it is wrapped in the last parentheses
+        name = stat[stat.index("(") + 1:stat.rindex(")")]
+        ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        table[int(entry)] = (ppid, name)
+    return table
+
+
+def _rss_bytes(pid):
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def sample_rss(root_pid):
+    """
+    Current RSS of the Playwright driver and the browser processes below root_pid.
+    The driver is the node process; everything else under it is Chromium.
+    """
+    table = _proc_table()
+    children = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+
+    driver = browser = 0
+    stack = list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        if table[pid][1] == "node":
+            driver += _rss_bytes(pid)
+        else:
+            browser += _rss_bytes(pid)
+    return driver, browser
+
+
+class MemorySampler:
+    """
+    Background sampler of peak RSS for the browser and driver of one UI keyword.
+    Linux-only (reads /proc); a no-op elsewhere or with JIRA_MEMORY_SAMPLING=0.
+    """
+
+    def __init__(self):
+        self.enabled = ENABLED and os.path.isdir("/proc")
+        self.peak_driver = self.peak_browser = self.peak_total = 0
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not self.enabled:
+            return self
+        self._thread = threading.Thread(target=self._run, name="jira-rss-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        root_pid = os.getpid()
+        while not self._stop.is_set():
+            try:
+                driver, browser = sample_rss(root_pid)
+            except Exception:
+                driver = browser = 0
+            self.peak_driver = max(self.peak_driver, driver)
+            self.peak_browser = max(self.peak_browser, browser)
+            self.peak_total = max(self.peak_total, driver + browser)
+            self.samples += 1
+            self._stop.wait(INTERVAL_SECONDS)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def report(self, name):
+        """Stop sampling, log the peaks and append them to results/memory_profile.csv."""
+        self.stop()
+        if not self.enabled or not self.samples:
+            return
+        mb = 1024 * 1024
+        row = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "keyword": name,
+            "peak_browser_mb": round(self.peak_browser / mb, 1),
+            "peak_driver_mb": round(self.peak_driver / mb, 1),
+            "peak_total_mb": round(self.peak_total / mb, 1),
+            "samples": self.samples,
+        }
+        logger.info(
+            f"Peak RSS for {name}: browser {row['peak_browser_mb']} MB, "
+            f"driver {row['peak_driver_mb']} MB, total {row['peak_total_mb']} MB"
+        )
+        try:
+            append_csv_row(REPORT_PATH, row)
+        except OSError as e:
+            logger.console(f"Warning: could not write memory profile: {e}")
@@ -0,0 +1,312 @@
+"""
+Performance regression gate: compare a run's keyword/step durations against a stored baseline.
+
+Usage (from repo root):
+    # seed or extend the baseline from earlier runs (plain or compacted outputs)
+    python Library/JiraPerfGate.py --history "results/archive/*.xml.gz" --update-baseline
+    # gate the latest run together with the 4 newest archived runs; writes results/perf_gate.html
+    python Library/JiraPerfGate.py --current results/output.xml --recent "results/archive/*.xml.gz" --fail
+
+Metrics (passing samples only, failures usually stop early or hit a full timeout):
+- test:<test>                  whole test duration
+- step:<test> > <keyword>      top-level keyword of a test
+- keyword:<library>.<keyword>  every top-level call of a keyword (test body, suite setup/teardown)
+
+A metric regresses when its current samples are slower than the baseline by a one-sided
+Mann-Whitney U test (p < --alpha), the median grew by at least --ratio and by at least
+--min-delta seconds. Slower medians without enough evidence are flagged as WARN.
+Tests and most steps yield one sample per run, so a single run can only WARN: pass several
+--current outputs, or --recent archived outputs (compactor archive, newest first by name) to
+gate the run together with the last --window runs. Only --current samples of metrics that
+neither regressed nor warned go into the baseline with --update-baseline.
+"""
+import argparse
+import gzip
+import html
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from JiraRunHistory import elapsed_seconds, expand_history
+
+BASELINE_PATH = os.getenv(
+    "JIRA_PERF_BASELINE",
+    os.path.join(os.path.expanduser("~"), ".cache", "jira-automation", "perf_baseline.json"),
+)
+# Newest samples kept per metric, so the baseline follows intended speed-ups
+MAX_SAMPLES = int(os.getenv("JIRA_PERF_BASELINE_SAMPLES", "200"))
+
+EXIT_REGRESSION = 4
+VERDICT_ORDER = ["REGRESSION", "WARN", "NEW", "OK", "IMPROVED"]
+
+
+def _open_output(path):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def iter_samples(path):
+    """
+    Stream (metric, seconds) pairs for passing tests and keywords of one output.xml (or .xml.gz).
+    Only top-level keyword calls are sampled: compacted outputs keep nothing deeper for passing
+    tests, and baseline and current samples must come from the same population.
+    """
+    stack = []
+    test = None
+
+    with _open_output(path) as f:
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                if elem.tag == "test":
+                    test = elem.get("name")
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            if elem.tag == "status" and parent is not None and elem.get("status") == "PASS":
+                seconds = elapsed_seconds(elem)
+                if seconds is not None:
+                    if parent.tag == "test":
+                        yield f"test:{test}", seconds
+                    elif parent.tag == "kw" and len(stack) >= 2 and stack[-2].tag in ("test", "suite"):
+                        owner = parent.get("owner") or parent.get("library")
+                        name = f"{owner}.{parent.get('name')}" if owner else parent.get("name")
+                        yield f"keyword:{name}", seconds
+                        if stack[-2].tag == "test":
+                            yield f"step:{test} > {parent.get('name')}", seconds
+            elif elem.tag == "test":
+                test = None
+            # Only the open element chain is needed; drop finished elements to keep memory flat
+            if parent is not None:
+                parent.remove(elem)
+
+
+def collect_samples(paths):
+    samples = {}
+    for path in paths:
+        try:
+            for metric, seconds in iter_samples(path):
+                samples.setdefault(metric, []).append(seconds)
+        except (ET.ParseError, OSError, EOFError):
+            # A truncated output (e.g. killed run) should not break the gate
+            print(f"Skipping unreadable output {path}")
+    return samples
+
+
+def windowed_samples(current, recent_paths, window):
+    """
+    Current samples plus those of the newest recent outputs, up to `window` runs per metric.
+    Outputs are taken newest first by file name (archive names start with the run timestamp);
+    only metrics of the current run are gated, so runs of other shards add nothing.
+    """
+    recent = sorted(recent_paths, key=os.path.basename, reverse=True)
+    runs = {metric: 1 for metric in current}
+    merged = {metric: list(values) for metric, values in current.items()}
+    for path in recent:
+        if all(count >= window for count in runs.values()):
+            break
+        for metric, values in collect_samples([path]).items():
+            if metric in runs and runs[metric] < window:
+                merged[metric].extend(values)
+                runs[metric] += 1
+    return merged
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {"metrics": {}, "runs": 0}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def update_baseline(baseline, samples, path, runs):
+    metrics = baseline.setdefault("metrics", {})
+    for metric, values in samples.items():
+        metrics[metric] = (metrics.get(metric, []) + values)[-MAX_SAMPLES:]
+    baseline["runs"] = baseline.get("runs", 0) + runs
+    baseline["updated"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+
+def mann_whitney_greater(current, baseline):
+    """
+    One-sided Mann-Whitney U test that `current` tends to be larger than `baseline`.
+    Normal approximation with tie and continuity correction; returns (U, p_value).
+    """
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    n = n1 + n2
+
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(baseline_samples, current_samples, alpha=0.05, ratio=1.2, min_delta=0.5, min_samples=3):
+    rows = []
+    for metric, current in current_samples.items():
+        base = baseline_samples.get(metric, [])
+        row = {
+            "metric": metric,
+            "n_base": len(base),
+            "n_current": len(current),
+            "median_base": statistics.median(base) if base else None,
+            "median_current": statistics.median(current),
+            "ratio": None,
+            "p_value": None,
+        }
+        if not base:
+            row["verdict"] = "NEW"
+            rows.append(row)
+            continue
+
+        row["ratio"] = row["median_current"] / row["median_base"] if row["median_base"] > 0 else None
+        delta = row["median_current"] - row["median_base"]
+        slower = row["ratio"] is not None and row["ratio"] >= ratio and delta >= min_delta
+        faster = row["ratio"] is not None and row["ratio"] <= 1 / ratio and -delta >= min_delta
+
+        significant = False
+        if len(base) >= min_samples:
+            _, row["p_value"] = mann_whitney_greater(current, base)
+            if min(current) > max(base):
+                # Complete separation: the exact p is cheap and sharper than the normal approximation
+                row["p_value"] = min(row["p_value"], 1 / math.comb(len(base) + len(current), len(current)))
+            # Never decide on a one-off sample, however long the baseline
+            significant = row["p_value"] < alpha and len(current) >= min_samples
+
+        if slower and significant:
+            row["verdict"] = "REGRESSION"
+        elif slower:
+            row["verdict"] = "WARN"
+        elif faster:
+            row["verdict"] = "IMPROVED"
+        else:
+            row["verdict"] = "OK"
+        rows.append(row)
+
+    rows.sort(key=lambda r: (VERDICT_ORDER.index(r["verdict"]), -(r["ratio"] or 0), r["metric"]))
+    return rows
+
+
+def _fmt(value, pattern):
+    return "" if value is None else pattern.format(value)
+
+
+def write_html(rows, path, settings):
+    counts = {verdict: sum(1 for r in rows if r["verdict"] == verdict) for verdict in VERDICT_ORDER}
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Performance gate</title><style>",
+        "body{font-family:sans-serif;margin:20px} table{border-collapse:collapse;font-size:12px}",
+        "td,th{border:1px solid #ccc;padding:3px 6px} td.num{text-align:right}",
+        ".REGRESSION{background:#f4a3a3} .WARN{background:#f9e0a6} .IMPROVED{background:#c5e8c1} .NEW{background:#dde7f5}",
+        "</style></head><body><h2>Performance gate</h2>",
+        f"<p>{html.escape(settings)}</p>",
+        "<p>" + " | ".join(f"{verdict}: {count}" for verdict, count in counts.items()) + "</p>",
+        "<table><tr><th>verdict</th><th>metric</th><th>baseline median s</th><th>current median s</th>"
+        "<th>ratio</th><th>p (slower)</th><th>n baseline</th><th>n current</th></tr>",
+    ]
+    for row in rows:
+        parts.append(
+            f"<tr class='{row['verdict']}'><td>{row['verdict']}</td><td>{html.escape(row['metric'])}</td>"
+            f"<td class='num'>{_fmt(row['median_base'], '{:.3f}')}</td>"
+            f"<td class='num'>{_fmt(row['median_current'], '{:.3f}')}</td>"
+            f"<td class='num'>{_fmt(row['ratio'], '{:.2f}x')}</td>"
+            f"<td class='num'>{_fmt(row['p_value'], '{:.3f}')}</td>"
+            f"<td class='num'>{row['n_base']}</td><td class='num'>{row['n_current']}</td></tr>"
+        )
+    parts.append("</table></body></html>")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare keyword/step durations against a stored baseline")
+    parser.add_argument("--current", action="append", default=[],
+                        help="output.xml (glob, repeatable) of the run(s) to gate")
+    parser.add_argument("--recent", action="append", default=[],
+                        help="Archived outputs (glob, repeatable) of earlier runs, gated with the current one")
+    parser.add_argument("--window", type=int, default=5,
+                        help="Runs per metric gated together, current included (with --recent)")
+    parser.add_argument("--history", action="append", default=[],
+                        help="Earlier outputs (glob, repeatable) added to the baseline with --update-baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--output", help="HTML diff table (default: perf_gate.html next to the current output)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level of the U test")
+    parser.add_argument("--ratio", type=float, default=1.2, help="Median slowdown ratio that counts as regression")
+    parser.add_argument("--min-delta", type=float, default=0.5, help="Ignore slowdowns below this many seconds")
+    parser.add_argument("--min-samples", type=int, default=3, help="Samples needed on each side for a verdict")
+    parser.add_argument("--fail", action="store_true", help=f"Exit {EXIT_REGRESSION} when a metric regressed")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Append history and current samples of unflagged metrics to the baseline")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    history_paths = expand_history(args.history)
+    if args.update_baseline and history_paths:
+        update_baseline(baseline, collect_samples(history_paths), args.baseline, len(history_paths))
+        print(f"Added {len(history_paths)} historical outputs to {args.baseline}")
+
+    current_paths = expand_history(args.current)
+    if not current_paths:
+        if not history_paths:
+            print("Nothing to do: pass --current and/or --history")
+            return 1
+        return 0
+
+    current = collect_samples(current_paths)
+    current_abs = {os.path.abspath(path) for path in current_paths}
+    recent_paths = [path for path in expand_history(args.recent) if os.path.abspath(path) not in current_abs]
+    gated = windowed_samples(current, recent_paths, args.window) if recent_paths else current
+    rows = compare(baseline.get("metrics", {}), gated, args.alpha, args.ratio, args.min_delta, args.min_samples)
+    regressions = [row for row in rows if row["verdict"] == "REGRESSION"]
+
+    html_path = args.output or os.path.join(os.path.dirname(os.path.abspath(current_paths[0])), "perf_gate.html")
+    window = f" + up to {args.window - 1} recent" if recent_paths else ""
+    settings = (f"Baseline {args.baseline} ({baseline.get('runs', 0)} runs) vs {len(current_paths)} current run(s)"
+                f"{window}; "
+                f"regression = p < {args.alpha}, median ratio >= {args.ratio}, delta >= {args.min_delta}s")
+    write_html(rows, html_path, settings)
+
+    for row in rows:
+        if row["verdict"] in ("REGRESSION", "WARN"):
+            print(f"{row['verdict']:<10} {row['metric']}: {row['median_base']:.2f}s -> {row['median_current']:.2f}s "
+                  f"({row['ratio']:.2f}x, p={_fmt(row['p_value'], '{:.3f}') or 'n/a'})")
+    print(f"{len(regressions)} regression(s) across {len(rows)} metrics; table in {html_path}")
+
+    if args.update_baseline:
+        # A slowdown must not become the new normal before it is understood
+        flagged = {row["metric"] for row in rows if row["verdict"] in ("REGRESSION", "WARN")}
+        accepted = {metric: values for metric, values in current.items() if metric not in flagged}
+        update_baseline(baseline, accepted, args.baseline, len(current_paths))
+        print(f"Updated {args.baseline}" + (f" (left out {len(flagged)} flagged metrics)" if flagged else ""))
+
+    if args.fail and regressions:
+        return EXIT_REGRESSION
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""
+Lazy handle on playwright.sync_api.
+
+`import JiraPlaywright as pw` is free at library import time; Playwright itself is loaded
+the first time pw.sync_playwright / pw.expect / pw.TimeoutError is touched, i.e. when a UI
+keyword actually runs. API-only runs never pay for the browser stack.
+"""
+import importlib
+import sys
+
+_MODULE = "playwright.sync_api"
+
+
+def loaded():
+    """True once Playwright has been imported in this process."""
+    return _MODULE in sys.modules
+
+
+def __getattr__(name):
+    value = getattr(importlib.import_module(_MODULE), name)
+    globals()[name] = value
+    return value
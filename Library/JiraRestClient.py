@@ -0,0 +1,51 @@
+import os
+import threading
+import requests
+
+from JiraConfig import JIRA_BASE_URL
+
+_local = threading.local()
+
+
+def jira_auth(email=None, token=None):
+    """Basic-auth pair; falls back to the values exported by INITIALIZE SECRETS."""
+    email = email or os.getenv("EMAIL")
+    token = token or os.getenv("API_TOKEN")
+    if not email or not token:
+        raise ValueError("EMAIL or API_TOKEN is not set - run INITIALIZE SECRETS first")
+    return email, token
+
+
+def _session():
+    # One keep-alive session per thread (fixture futures run on worker threads)
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def jira_request(method, path, email=None, token=None, expected_status=None, **kwargs):
+    """
+    Call the Jira REST API and return the response.
+    Raises AssertionError when expected_status is given and does not match.
+    """
+    headers = {"Accept": "application/json"}
+    headers.update(kwargs.pop("headers", {}))
+    kwargs.setdefault("timeout", 30)
+
+    response = _session().request(
+        method, f"{JIRA_BASE_URL}{path}", auth=jira_auth(email, token), headers=headers, **kwargs
+    )
+    if expected_status is not None and response.status_code != expected_status:
+        raise AssertionError(
+            f"{method} {path} returned {response.status_code}, expected {expected_status}: {response.text[:500]}"
+        )
+    return response
+
+
+def search_issues(jql, fields="summary", max_results=50):
+    """Run a JQL search and return the matching issues (enhanced search endpoint)."""
+    response = jira_request(
+        "GET", "/rest/api/2/search/jql", expected_status=200,
+        params={"jql": jql, "fields": fields, "maxResults": max_results},
+    )
+    return response.json().get("issues", [])
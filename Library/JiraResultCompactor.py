@@ -0,0 +1,174 @@
+"""
+Compact, streaming post-processing of Robot output.xml.
+
+Usage (from repo root):
+    python Library/JiraResultCompactor.py results/output.xml --archive-dir results/archive
+
+Writes next to the input:
+- output.compact.xml.gz: passing tests/keywords keep their status but lose their keyword bodies,
+  failing ones are kept in full. `gunzip -k` it and rebot still renders log/report from it.
+- run_summary.json: per-test and top-level keyword timings for trend tooling.
+The input is parsed incrementally, so memory stays flat for long or repeated runs.
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+from JiraRunHistory import elapsed_seconds
+
+# Elements written as open/close tags around their streamed children
+CONTAINERS = {"robot", "suite"}
+# Body items whose content is dropped when they passed
+BODY_TAGS = {"kw", "for", "while", "if", "try", "group", "variable", "return", "break", "continue", "error"}
+
+
+def _start_time(status):
+    return status.get("start") or status.get("starttime")
+
+
+def _strip_body(elem):
+    """Keep only the <status> of a passed body item (same shape as rebot --removekeywords passed)."""
+    for child in list(elem):
+        if child.tag != "status":
+            elem.remove(child)
+
+
+def _status(elem):
+    return elem.find("status")
+
+
+def _compact_test(test):
+    status = _status(test)
+    passed = status is not None and status.get("status") in ("PASS", "SKIP")
+    keywords = []
+    for child in test:
+        if child.tag not in BODY_TAGS:
+            continue
+        child_status = _status(child)
+        if child_status is not None:
+            keywords.append({
+                "name": child.get("name") or child.tag.upper(),
+                "owner": child.get("owner") or child.get("library"),
+                "status": child_status.get("status"),
+                "elapsed": elapsed_seconds(child_status),
+            })
+        if passed:
+            _strip_body(child)
+    summary = {
+        "name": test.get("name"),
+        "status": status.get("status") if status is not None else None,
+        "start": _start_time(status) if status is not None else None,
+        "elapsed": elapsed_seconds(status) if status is not None else None,
+        "tags": [tag.text for tag in test.findall("tag")],
+        "keywords": keywords,
+    }
+    return summary
+
+
+def compact(source, compact_path, summary_path):
+    """Stream source output.xml into a compact gzip copy and a JSON timing summary."""
+    summary = {"source": os.path.abspath(source), "tests": [], "totals": {"pass": 0, "fail": 0, "skip": 0}}
+    stack = []
+    suite_path = []
+
+    with gzip.open(compact_path, "wt", encoding="utf-8") as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                # Streamed containers are robot/suite elements directly below other streamed ones
+                streamed = elem.tag in CONTAINERS and (not stack or stack[-1][1])
+                stack.append((elem, streamed))
+                if streamed:
+                    attrs = "".join(f" {key}={quoteattr(value)}" for key, value in elem.attrib.items())
+                    out.write(f"<{elem.tag}{attrs}>\n")
+                    if elem.tag == "robot":
+                        summary["generator"] = elem.get("generator")
+                        summary["generated"] = elem.get("generated")
+                    elif elem.tag == "suite":
+                        suite_path.append(elem.get("name"))
+                continue
+
+            _, streamed = stack.pop()
+            parent, parent_streamed = stack[-1] if stack else (None, True)
+            if streamed:
+                out.write(f"</{elem.tag}>\n")
+                if elem.tag == "suite":
+                    suite_path.pop()
+                if parent is not None:
+                    parent.remove(elem)
+                continue
+            if not parent_streamed:
+                # Nested content; serialized with its top-level ancestor
+                continue
+
+            if elem.tag == "test":
+                test_summary = _compact_test(elem)
+                test_summary["suite"] = ".".join(suite_path)
+                summary["tests"].append(test_summary)
+                key = (test_summary["status"] or "").lower()
+                if key in summary["totals"]:
+                    summary["totals"][key] += 1
+            elif elem.tag in BODY_TAGS:
+                status = _status(elem)
+                if status is not None and status.get("status") in ("PASS", "SKIP", "NOT RUN"):
+                    _strip_body(elem)
+            elif elem.tag == "status" and parent.tag == "suite" and len(suite_path) == 1:
+                summary["status"] = elem.get("status")
+                summary["start"] = _start_time(elem)
+                summary["elapsed"] = elapsed_seconds(elem)
+
+            elem.tail = "\n"
+            out.write(ET.tostring(elem, encoding="unicode"))
+            parent.remove(elem)
+
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=1)
+    return summary
+
+
+def archive(paths, archive_dir, stamp):
+    """Copy run artifacts into archive_dir, prefixed with the run timestamp."""
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = []
+    for path in paths:
+        target = os.path.join(archive_dir, f"{stamp}-{os.path.basename(path)}")
+        shutil.copyfile(path, target)
+        archived.append(target)
+    return archived
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact Robot output.xml and extract a JSON timing summary")
+    parser.add_argument("output", help="Robot output.xml to process")
+    parser.add_argument("--output-dir", help="Where to write results (default: next to the input)")
+    parser.add_argument("--archive-dir", help="Also keep timestamped copies of the compact artifacts here")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.output):
+        print(f"No output file at {args.output}")
+        return 1
+
+    out_dir = args.output_dir or os.path.dirname(os.path.abspath(args.output))
+    os.makedirs(out_dir, exist_ok=True)
+    compact_path = os.path.join(out_dir, "output.compact.xml.gz")
+    summary_path = os.path.join(out_dir, "run_summary.json")
+
+    summary = compact(args.output, compact_path, summary_path)
+    before, after = os.path.getsize(args.output), os.path.getsize(compact_path)
+    print(f"Compacted {args.output}: {before / 1024:.0f} KB -> {after / 1024:.0f} KB ({compact_path})")
+    print(f"Summary: {len(summary['tests'])} tests, totals {summary['totals']} ({summary_path})")
+
+    if args.archive_dir:
+        stamp = (summary.get("generated") or summary.get("start") or "run").replace(":", "").replace(" ", "T")
+        for path in archive([compact_path, summary_path], args.archive_dir, stamp):
+            print(f"Archived {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
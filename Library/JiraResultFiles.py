@@ -0,0 +1,30 @@
+import csv
+import json
+import os
+
+# Shared writers for the small result/state files the libraries keep; both raise OSError
+# and leave the warning to the caller.
+
+
+def _ensure_parent(path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+
+def append_csv_row(path, row):
+    """Append one dict row to a CSV report, writing the header when the file is new."""
+    _ensure_parent(path)
+    write_header = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(row))
+        if write_header:
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def write_json_atomic(path, data, **dump_options):
+    """Write JSON via a temp file + rename, so readers never see a half-written store."""
+    _ensure_parent(path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, **dump_options)
+    os.replace(tmp_path, path)
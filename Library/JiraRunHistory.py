@@ -0,0 +1,81 @@
+import glob
+import statistics
+from datetime import datetime
+import xml.etree.ElementTree as ET
+
+
+def elapsed_seconds(status):
+    """
+    Elapsed time of a Robot <status> element in seconds.
+    Handles both RF 7 ('start'/'elapsed') and older ('starttime'/'endtime') output formats.
+    """
+    if status.get("elapsed") is not None:
+        return float(status.get("elapsed"))
+
+    start, end = status.get("starttime"), status.get("endtime")
+    if not start or not end or "N/A" in (start, end):
+        return None
+    fmt = "%Y%m%d %H:%M:%S.%f"
+    return (datetime.strptime(end, fmt) - datetime.strptime(start, fmt)).total_seconds()
+
+
+def iter_test_results(path):
+    """
+    Stream (test_name, status, elapsed_seconds) tuples from a Robot output.xml.
+
+    Uses an incremental parser and clears finished elements, so memory stays flat
+    however large the output file gets.
+    """
+    stack = []
+    test_name = None
+    test_status = None
+
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        if event == "start":
+            stack.append(elem.tag)
+            if elem.tag == "test":
+                test_name, test_status = elem.get("name"), None
+            continue
+
+        stack.pop()
+        if elem.tag == "status" and stack and stack[-1] == "test":
+            test_status = (elem.get("status"), elapsed_seconds(elem))
+        elif elem.tag == "test":
+            if test_status:
+                yield test_name, test_status[0], test_status[1]
+            test_name = None
+        if "test" in stack or elem.tag == "test":
+            elem.clear()
+
+
+def expand_history(patterns):
+    """Resolve history glob patterns into a sorted, de-duplicated list of output.xml paths."""
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(pattern, recursive=True))
+    return sorted(paths)
+
+
+def collect_test_durations(paths, include_failed=False):
+    """
+    Gather historical durations per test name across archived output.xml files.
+    Failed runs are skipped by default since they usually stop early or hit a full timeout.
+    """
+    durations = {}
+    for path in paths:
+        try:
+            for name, status, elapsed in iter_test_results(path):
+                if elapsed is None or status == "SKIP":
+                    continue
+                if status == "FAIL" and not include_failed:
+                    continue
+                durations.setdefault(name, []).append(elapsed)
+        except ET.ParseError:
+            # A truncated output.xml (e.g. killed run) should not break planning
+            continue
+    return durations
+
+
+def expected_durations(durations):
+    """Median of the recorded samples for each test."""
+    return {name: statistics.median(samples) for name, samples in durations.items() if samples}
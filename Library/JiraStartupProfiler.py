@@ -0,0 +1,92 @@
+"""
+Robot listener that profiles suite start-up.
+
+Usage:
+    robot --listener Library/JiraStartupProfiler.py -d results Tests/Test_E2Eflow_JiraIssue_Task.robot
+
+Writes startup_profile.json next to output.xml (results/ when output is disabled) with:
+- per-library import time (time since the previous import event, imports run sequentially)
+- time from listener start to the first test
+- whether Playwright was loaded at all, and by which test
+"""
+import json
+import os
+import sys
+import time
+from robot.api import logger
+
+from JiraConfig import RESULTS_DIR
+
+PLAYWRIGHT_MODULE = "playwright.sync_api"
+
+
+def _playwright_loaded():
+    return PLAYWRIGHT_MODULE in sys.modules
+
+
+class JiraStartupProfiler:
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.last_event = self.started
+        self.imports = []
+        self.first_test_after = None
+        self.playwright_loaded_by = "startup" if _playwright_loaded() else None
+        self.output_dir = RESULTS_DIR
+
+    def _elapsed_since_last(self):
+        now = time.perf_counter()
+        elapsed, self.last_event = now - self.last_event, now
+        return round(elapsed, 4)
+
+    def _record_import(self, kind, name, attrs):
+        self.imports.append({
+            "kind": kind,
+            "name": name,
+            "source": attrs.get("source"),
+            "seconds": self._elapsed_since_last(),
+            "playwright_loaded": _playwright_loaded(),
+        })
+        if self.playwright_loaded_by is None and _playwright_loaded():
+            self.playwright_loaded_by = f"import of {name}"
+
+    def library_import(self, name, attrs):
+        self._record_import("library", name, attrs)
+
+    def resource_import(self, name, attrs):
+        self._record_import("resource", name, attrs)
+
+    def start_test(self, name, attrs):
+        if self.first_test_after is None:
+            self.first_test_after = round(time.perf_counter() - self.started, 4)
+
+    def end_test(self, name, attrs):
+        if self.playwright_loaded_by is None and _playwright_loaded():
+            self.playwright_loaded_by = attrs.get("longname", name)
+
+    def output_file(self, path):
+        self.output_dir = os.path.dirname(os.path.abspath(path))
+
+    def close(self):
+        profile = {
+            "imports": self.imports,
+            "import_seconds_total": round(sum(item["seconds"] for item in self.imports), 4),
+            "first_test_after_seconds": self.first_test_after,
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "playwright_loaded": _playwright_loaded(),
+            "playwright_loaded_by": self.playwright_loaded_by,
+        }
+        slowest = sorted(self.imports, key=lambda item: item["seconds"], reverse=True)[:3]
+        logger.console(
+            "Startup: first test after "
+            f"{profile['first_test_after_seconds']}s; slowest imports: "
+            + ", ".join(f"{item['name']} {item['seconds']}s" for item in slowest)
+            + f"; Playwright loaded: {profile['playwright_loaded_by'] or 'never'}"
+        )
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, "startup_profile.json"), "w", encoding="utf-8") as f:
+                json.dump(profile, f, indent=1)
+        except OSError as e:
+            logger.console(f"Warning: could not write startup profile: {e}")
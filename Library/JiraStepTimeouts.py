@@ -0,0 +1,155 @@
+"""
+Adaptive per-step timeouts learned from recorded latencies (see StepTimeoutPolicy).
+
+Parallel runners (CI shards) each record into a copy of the store; fold their new
+samples back into the shared store with:
+    python Library/JiraStepTimeouts.py --base state/step_latency.json \
+        --output state/step_latency.json "shards/*/step_latency.json"
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import sys
+import time
+from contextlib import contextmanager
+from robot.api import logger
+
+from JiraConfig import RESULTS_DIR
+from JiraResultFiles import write_json_atomic
+
+# Policy knobs (env overridable)
+STORE_PATH = os.getenv("JIRA_STEP_LATENCY_STORE", os.path.join(RESULTS_DIR, "step_latency.json"))
+PERCENTILE = float(os.getenv("JIRA_TIMEOUT_PERCENTILE", "95"))
+SAFETY_FACTOR = float(os.getenv("JIRA_TIMEOUT_SAFETY_FACTOR", "2.0"))
+MIN_SAMPLES = int(os.getenv("JIRA_TIMEOUT_MIN_SAMPLES", "5"))
+FLOOR_MS = int(os.getenv("JIRA_TIMEOUT_FLOOR_MS", "2000"))
+MAX_SAMPLES = int(os.getenv("JIRA_TIMEOUT_MAX_SAMPLES", "50"))
+ENABLED = os.getenv("JIRA_ADAPTIVE_TIMEOUTS", "1") != "0"
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class StepTimeoutPolicy:
+    """
+    Per-step timeout budgets learned from recorded latencies.
+
+    Each named step keeps its last MAX_SAMPLES latencies in a small JSON store.
+    Once a step has MIN_SAMPLES, its budget is PERCENTILE x SAFETY_FACTOR, never below
+    FLOOR_MS and never above the hand-picked constant (cap) the step used before.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.samples = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        write_json_atomic(self.path, self.samples, indent=1, sort_keys=True)
+
+    def budget(self, step, cap_ms):
+        """Timeout in ms for a step; falls back to the cap until enough samples exist."""
+        samples = self.samples.get(step, [])
+        if not ENABLED or len(samples) < MIN_SAMPLES:
+            return cap_ms
+        learned = percentile(samples, PERCENTILE) * SAFETY_FACTOR
+        return int(min(cap_ms, max(FLOOR_MS, learned)))
+
+    def record(self, step, elapsed_ms):
+        samples = self.samples.setdefault(step, [])
+        samples.append(round(elapsed_ms, 1))
+        del samples[:-MAX_SAMPLES]
+        try:
+            self._save()
+        except OSError as e:
+            logger.console(f"Warning: could not persist step latency store: {e}")
+
+    @contextmanager
+    def step(self, name, cap_ms):
+        """
+        Yield the budget for a named step and record how long the step took.
+        A step that fails after using up its budget is recorded at the budget, so a slow
+        streak widens the budget on the next run instead of failing again. Elapsed time
+        decides, not the exception type: locator waits raise TimeoutError, while
+        expect(...) assertions raise AssertionError when they time out.
+        """
+        budget = self.budget(name, cap_ms)
+        start = time.perf_counter()
+        try:
+            yield budget
+        except Exception:
+            if (time.perf_counter() - start) * 1000.0 >= budget:
+                self.record(name, budget)
+                if budget < cap_ms:
+                    logger.console(f"Step '{name}' exceeded learned budget {budget} ms (cap {cap_ms} ms)")
+            raise
+        self.record(name, (time.perf_counter() - start) * 1000.0)
+
+
+_policy = None
+
+
+def timeout_policy():
+    """Process-wide policy instance, loaded lazily from the store."""
+    global _policy
+    if _policy is None:
+        _policy = StepTimeoutPolicy()
+    return _policy
+
+
+def step_timeout(name, cap_ms):
+    """Shortcut: `with step_timeout("flow.step", 15000) as timeout: locator.wait_for(timeout=timeout)`."""
+    return timeout_policy().step(name, cap_ms)
+
+
+def new_samples(base, recorded):
+    """
+    Samples a runner appended to its copy of `base`. The copy may have dropped the
+    oldest samples (MAX_SAMPLES), so the longest suffix of base it starts with is skipped.
+    """
+    for start in range(len(base) + 1):
+        overlap = base[start:]
+        if recorded[:len(overlap)] == overlap:
+            return recorded[len(overlap):]
+    return recorded
+
+
+def merge_stores(base, stores):
+    """Base store plus the new samples of every runner store, newest MAX_SAMPLES per step."""
+    merged = {step: list(samples) for step, samples in base.items()}
+    for store in stores:
+        for step, samples in store.items():
+            added = new_samples(base.get(step, []), samples)
+            merged[step] = (merged.get(step, []) + added)[-MAX_SAMPLES:]
+    return merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge step latency stores recorded by parallel runners")
+    parser.add_argument("stores", nargs="+", help="Runner step_latency.json files (globs allowed)")
+    parser.add_argument("--base", help="Store the runners started from")
+    parser.add_argument("--output", required=True, help="Merged store to write")
+    args = parser.parse_args(argv)
+
+    base = StepTimeoutPolicy(args.base).samples if args.base else {}
+    paths = sorted(path for pattern in args.stores for path in glob.glob(pattern))
+    merged = merge_stores(base, [StepTimeoutPolicy(path).samples for path in paths])
+    write_json_atomic(args.output, merged, indent=1, sort_keys=True)
+    print(f"Merged {len(paths)} store(s) into {args.output}: {len(merged)} steps")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
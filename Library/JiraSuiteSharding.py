@@ -0,0 +1,115 @@
+"""
+Split the Robot suite across N containers by expected test duration.
+
+Usage (from repo root):
+    python Library/JiraSuiteSharding.py --suite Tests/Test_E2Eflow_JiraIssue_Task.robot \\
+        --shards 3 --index 0 --output results/shard.args
+
+The written argument file is passed to `robot --argumentfile`. Shard outputs are
+combined afterwards with `rebot`, e.g.:
+    rebot --name "Test E2Eflow JiraIssue Task" -d results results/shard-*/output.xml
+"""
+import argparse
+import heapq
+import os
+import statistics
+import sys
+
+from robot.api import SuiteVisitor, TestSuiteBuilder
+
+from JiraRunHistory import collect_test_durations, expand_history, expected_durations
+
+DEFAULT_HISTORY = ["results/**/output.xml", "Tests/output.xml"]
+DEFAULT_NEW_TEST_SECONDS = 60.0
+
+
+def suite_test_names(suite_path, includes=None, excludes=None):
+    """Test names of the suite in file order, after tag filtering."""
+    suite = TestSuiteBuilder().build(suite_path)
+    if includes or excludes:
+        suite.filter(included_tags=includes or None, excluded_tags=excludes or None)
+    collector = _TestCollector()
+    suite.visit(collector)
+    return collector.names
+
+
+class _TestCollector(SuiteVisitor):
+    def __init__(self):
+        self.names = []
+
+    def visit_test(self, test):
+        self.names.append(test.name)
+
+
+def plan_shards(test_names, expected, shards, new_test_seconds=None):
+    """
+    Greedy longest-first bin packing: each test goes to the currently lightest shard.
+    Tests without history get the median known duration (or the fixed fallback).
+    Returns a list of (total_seconds, [(name, seconds), ...]) per shard.
+    """
+    if new_test_seconds is None:
+        known = [expected[name] for name in test_names if name in expected]
+        new_test_seconds = statistics.median(known) if known else DEFAULT_NEW_TEST_SECONDS
+
+    weighted = [(expected.get(name, new_test_seconds), name) for name in test_names]
+    weighted.sort(key=lambda item: (-item[0], item[1]))
+
+    bins = [(0.0, index) for index in range(shards)]
+    heapq.heapify(bins)
+    assigned = [[] for _ in range(shards)]
+    for seconds, name in weighted:
+        total, index = heapq.heappop(bins)
+        assigned[index].append((name, seconds))
+        heapq.heappush(bins, (total + seconds, index))
+
+    return [(sum(seconds for _, seconds in tests), tests) for tests in assigned]
+
+
+def robot_name_pattern(name):
+    """Escape Robot's --test glob characters so the name matches literally."""
+    return "".join(f"[{ch}]" if ch in "*?[]" else ch for ch in name)
+
+
+def write_argument_file(path, tests):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for name, _ in tests:
+            f.write(f"--test {robot_name_pattern(name)}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Duration-aware sharding of the Robot suite")
+    parser.add_argument("--suite", required=True, help="Robot suite file or directory")
+    parser.add_argument("--shards", type=int, required=True, help="Total number of shards")
+    parser.add_argument("--index", type=int, required=True, help="Zero-based shard index to emit")
+    parser.add_argument("--output", required=True, help="Argument file to write for this shard")
+    parser.add_argument("--history", action="append", help="Glob(s) of archived output.xml files")
+    parser.add_argument("--include", action="append", help="Only plan tests with these tags")
+    parser.add_argument("--exclude", action="append", help="Skip tests with these tags")
+    parser.add_argument("--new-test-seconds", type=float, help="Expected duration for tests without history")
+    args = parser.parse_args(argv)
+
+    if args.shards < 1 or not 0 <= args.index < args.shards:
+        parser.error("--index must be between 0 and --shards - 1")
+
+    history = expand_history(args.history or DEFAULT_HISTORY)
+    expected = expected_durations(collect_test_durations(history))
+    names = suite_test_names(args.suite, args.include, args.exclude)
+    plan = plan_shards(names, expected, args.shards, args.new_test_seconds)
+
+    print(f"History files: {len(history)} | tests: {len(names)} | shards: {args.shards}")
+    for index, (total, tests) in enumerate(plan):
+        marker = "*" if index == args.index else " "
+        print(f"{marker} shard {index}: {len(tests)} tests, ~{total:.1f}s")
+        for name, seconds in tests:
+            source = "history" if name in expected else "fallback"
+            print(f"      {seconds:8.1f}s  {name}  ({source})")
+
+    tests = plan[args.index][1]
+    write_argument_file(args.output, tests)
+    # Exit code 3 tells the caller this shard has nothing to run
+    return 0 if tests else 3
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
-import os
-import json
 from robot.api.deco import keyword, library
-from playwright.sync_api import sync_playwright, expect, TimeoutError
+import JiraPlaywright as pw
 from robot.api import logger
+from JiraStepTimeouts import step_timeout
+from JiraBrowserSession import jira_page
+from JiraConfig import JIRA_BASE_URL
 
 
 @library
@@ -15,46 +16,16 @@ class JiraTaskFieldsValidation:
         label = "APIUITest"
         comment_text = "This is a test comment from UI."
 
-        # ================================ LOAD COOKIES ================================
-        cookie_path = os.path.join(os.path.dirname(__file__), "jira_cookies.json")
-        if not os.path.exists(cookie_path):
-            raise FileNotFoundError("jira_cookies.json not found in Library folder")
-
-        with open(cookie_path, "r", encoding="utf-8") as f:
-            cookies = json.load(f)
-
         # ================================ START PLAYWRIGHT ================================
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, slow_mo=50)
-            context = browser.new_context()
-
-            # Clear and add cookies
-            context.clear_cookies()
-            try:
-                context.add_cookies(cookies)
-            except Exception:
-                context.add_cookies([c for c in cookies])
-
-            page = context.new_page()
-            page.set_default_timeout(60000)
-
-            # ================================ NAVIGATE TO JIRA ================================
-            logger.console("Navigating to Jira...")
-
-            try:
-                page.goto("https://automationbot999.atlassian.net", wait_until="domcontentloaded")
-                if "login" in page.url.lower():
-                    raise TimeoutError("Cookie session expired")
-            except TimeoutError:
-                logger.console("Cookie expired → redirecting to login")
-                page.goto("https://id.atlassian.com/login", wait_until="domcontentloaded")
-                raise
+        # Cookies loaded and Jira opened (or a pre-warmed session picked up)
+        with jira_page("Run Jira UI Flow With Fields", slow_mo=50, default_timeout=60000) as page:
 
             # ================================ OPEN PROJECT ================================
             logger.console("Opening project...")
             try:
                 project = page.locator("a[href*='/browse/DEMO']").first
-                project.wait_for(state="visible", timeout=35000)
+                with step_timeout("task_fields.project_link", 35000) as timeout:
+                    project.wait_for(state="visible", timeout=timeout)
                 project.click()
                 page.wait_for_timeout(1000)
             except Exception:
@@ -64,23 +35,25 @@ class JiraTaskFieldsValidation:
             logger.console(f"Opening Issue {issue_key} ...")
 
             page.goto(
-                f"https://automationbot999.atlassian.net/browse/{issue_key}",
+                f"{JIRA_BASE_URL}/browse/{issue_key}",
                 wait_until="domcontentloaded"
             )
 
             # Wait for React to fully render header
             try:
-                page.wait_for_selector(
-                    "[data-testid='issue.views.issue-base.foundation.summary.heading']",
-                    timeout=60000
-                )
-            except TimeoutError:
+                with step_timeout("task_fields.summary_heading", 60000) as timeout:
+                    page.wait_for_selector(
+                        "[data-testid='issue.views.issue-base.foundation.summary.heading']",
+                        timeout=timeout
+                    )
+            except pw.TimeoutError:
                 logger.console(" Issue header did not load — possible redirect or cookie problem")
                 logger.console("Final URL: " + page.url)
                 raise
 
             # Also ensure issue key is present in DOM
-            expect(page.locator(f"text={issue_key}").first).to_be_visible(timeout=60000)
+            with step_timeout("task_fields.issue_key", 60000) as timeout:
+                pw.expect(page.locator(f"text={issue_key}").first).to_be_visible(timeout=timeout)
 
             # After this point, page == page1 in previous version
             page1 = page
@@ -102,10 +75,11 @@ class JiraTaskFieldsValidation:
             page1.get_by_test_id("issue-field-priority-readview-full.ui.priority.wrapper").click()
 
             pr_option = page1.get_by_text(issue_priority, exact=True)
-            pr_option.wait_for(state="visible", timeout=15000)
+            with step_timeout("task_fields.priority_option", 15000) as timeout:
+                pr_option.wait_for(state="visible", timeout=timeout)
             pr_option.click()
 
-            expect(
+            pw.expect(
                 page1.get_by_test_id("issue-field-priority-readview-full.ui.priority.wrapper").locator("span")
             ).to_contain_text(issue_priority)
 
@@ -129,7 +103,7 @@ class JiraTaskFieldsValidation:
             page1.get_by_test_id("issue.views.issue-base.foundation.summary.heading").click()
             page1.wait_for_timeout(600)
 
-            expect(label_container).to_contain_text(label)
+            pw.expect(label_container).to_contain_text(label)
             logger.console(f"Label set: {label}")
 
             # ================================ ADD COMMENT ================================
@@ -148,13 +122,15 @@ class JiraTaskFieldsValidation:
             page1.evaluate("el => el.click()", comment_placeholder.element_handle())
 
             editor = page1.locator('div[role="textbox"]')
-            editor.wait_for(state="visible", timeout=10000)
+            with step_timeout("task_fields.comment_editor", 10000) as timeout:
+                editor.wait_for(state="visible", timeout=timeout)
 
             editor.fill(comment_text)
 
             page1.get_by_test_id("comment-save-button").click()
 
-            expect(page1.get_by_text(comment_text)).to_be_visible(timeout=8000)
+            with step_timeout("task_fields.comment_saved", 8000) as timeout:
+                pw.expect(page1.get_by_text(comment_text)).to_be_visible(timeout=timeout)
             logger.console(f"Comment added: {comment_text}")
 
             # ================================ RESULTS ================================
@@ -166,7 +142,4 @@ class JiraTaskFieldsValidation:
                 f"- Comment: {comment_text}"
             )
 
-            context.close()
-            browser.close()
-
             return assignee_name, issue_priority, label, comment_text
@@ -1,8 +1,8 @@
-import os
-import json
 from robot.api.deco import keyword, library
-from playwright.sync_api import sync_playwright, expect
+import JiraPlaywright as pw
 from robot.api import logger
+from JiraStepTimeouts import step_timeout
+from JiraBrowserSession import jira_page
 
 @library
 class JiraTaskandSubtaskIntegration:
@@ -18,27 +18,14 @@ class JiraTaskandSubtaskIntegration:
 
         subtask_summary = f"Subtask for {issue_key}"
 
-        # Load cookies
-        cookie_path = os.path.join(os.path.dirname(__file__), "jira_cookies.json")
-        if not os.path.exists(cookie_path):
-            raise FileNotFoundError("jira_cookies.json not found in Library folder")
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, slow_mo=100)
-            context = browser.new_context()
-
-            with open(cookie_path, "r") as f:
-                cookies = json.load(f)
-            context.add_cookies(cookies)
-
-            page = context.new_page()
-            page.set_default_timeout(20000)
-            print(" Navigating to Jira instance...")
-            page.goto("https://automationbot999.atlassian.net", wait_until="domcontentloaded", timeout=60000)
+        # Cookies loaded and Jira opened (or a pre-warmed session picked up)
+        with jira_page("Run Jira UI Flow", slow_mo=100, default_timeout=20000) as page:
+            print(" Jira instance opened.")
 
             # Navigate to project
             print(" Waiting for project link...")
-            page.wait_for_selector("text=JiraAutomationDemo", timeout=30000)
+            with step_timeout("subtask.project_link", 30000) as timeout:
+                page.wait_for_selector("text=JiraAutomationDemo", timeout=timeout)
             project_link = page.locator("a[href*='/browse/DEMO']").first
             project_link.scroll_into_view_if_needed()
             project_link.click(force=True)
@@ -47,20 +34,23 @@ class JiraTaskandSubtaskIntegration:
             # Validate issue, summary and status
             print(" Validating issue panel for:", issue_key)
             breadcrumb = page.get_by_test_id("issue.views.issue-base.foundation.breadcrumbs.current-issue.item").locator("span")
-            breadcrumb.wait_for(state="visible", timeout=15000)
+            with step_timeout("subtask.breadcrumb", 15000) as timeout:
+                breadcrumb.wait_for(state="visible", timeout=timeout)
 
             summary_heading = page.get_by_test_id("issue.views.issue-base.foundation.summary.heading")
-            summary_heading.wait_for(state="visible", timeout=15000)
+            with step_timeout("subtask.summary_heading", 15000) as timeout:
+                summary_heading.wait_for(state="visible", timeout=timeout)
 
             actual_summary = summary_heading.inner_text().strip()
-            expect(breadcrumb).to_contain_text(issue_key)
-            expect(summary_heading).to_contain_text("Automated Test Issue")
+            pw.expect(breadcrumb).to_contain_text(issue_key)
+            pw.expect(summary_heading).to_contain_text("Automated Test Issue")
             print(f"Issue {issue_key} is visible with summary '{actual_summary}'")
 
 
             #verify status
             status_element = page.locator("//span[normalize-space(text())='In Progress']")
-            status_element.wait_for(state="visible", timeout=10000)
+            with step_timeout("subtask.status", 10000) as timeout:
+                status_element.wait_for(state="visible", timeout=timeout)
             status_text = status_element.inner_text()
             print(f" Status on UI: {status_text}")
 
@@ -71,26 +61,30 @@ class JiraTaskandSubtaskIntegration:
 
             add_button = page.locator(
                 "//div[@data-testid='issue-view-base.content.add-work-items.child-items-prompt.container']//button[@type='button']")
-            add_button.wait_for(state="visible", timeout=10000)
+            with step_timeout("subtask.add_button", 10000) as timeout:
+                add_button.wait_for(state="visible", timeout=timeout)
             add_button.scroll_into_view_if_needed()
             add_button.click()
             page.wait_for_timeout(1000)
 
             subtask_input = page.locator("//input[@id='childIssuesPanel']")
-            subtask_input.wait_for(state="visible", timeout=10000)
+            with step_timeout("subtask.subtask_input", 10000) as timeout:
+                subtask_input.wait_for(state="visible", timeout=timeout)
             subtask_input.fill(subtask_summary)
             page.keyboard.press("Enter")
             page.wait_for_timeout(2000)
 
             # Confirm subtask creation
-            page.wait_for_selector(f"text={subtask_summary}", timeout=15000)
+            with step_timeout("subtask.subtask_created", 15000) as timeout:
+                page.wait_for_selector(f"text={subtask_summary}", timeout=timeout)
             print(f" Subtask with name :'{subtask_summary}' created successfully.")
             logger.console(f"Subtask with name :'{subtask_summary}' created successfully in UI")
 
             # Locate subtask summary link using XPath and extract ID from href
             subtask_summary_xpath = f"//a[normalize-space()='{subtask_summary}']"
             subtask_summary_element = page.locator(subtask_summary_xpath)
-            subtask_summary_element.wait_for(state="visible", timeout=15000)
+            with step_timeout("subtask.subtask_link", 15000) as timeout:
+                subtask_summary_element.wait_for(state="visible", timeout=timeout)
 
             subtask_href = subtask_summary_element.get_attribute("href")
             subtask_id = subtask_href.split("/")[-1] if subtask_href else "UNKNOWN"
@@ -110,7 +104,4 @@ class JiraTaskandSubtaskIntegration:
             print(" Jira UI flow completed successfully.")
             #page.screenshot(path=f"jira_ui_flow_success_{issue_key}.png")
 
-            context.close()
-            browser.close()
-
 
@@ -0,0 +1,238 @@
+"""
+Per-action hot-spot profile built from Playwright traces.
+
+Record traces with JIRA_PROFILE_TRACES=1 (one zip per UI keyword under results/traces/<keyword>/),
+then aggregate them offline (from repo root):
+    python Library/JiraTraceProfiler.py --traces results/traces --output-dir results
+
+Writes results/action_profile.csv and results/action_profile.html (flame-graph-style view:
+one row per keyword, its actions laid out by share of total time).
+"""
+import argparse
+import csv
+import glob
+import html
+import json
+import os
+import sys
+import zipfile
+
+# Protocol methods whose whole duration is an explicit wait
+WAIT_METHODS = {
+    "waitForTimeout", "waitForSelector", "waitForFunction", "waitForLoadState",
+    "waitForURL", "waitForEventInfo", "expect",
+}
+
+CSV_COLUMNS = [
+    "keyword", "action", "selector", "calls", "total_ms", "mean_ms",
+    "wait_ms", "actionability_ms", "network_ms", "retries", "errors",
+]
+
+
+def _read_jsonl(archive, suffix):
+    events = []
+    for member in archive.namelist():
+        if member.endswith(suffix):
+            with archive.open(member) as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        events.append(json.loads(line))
+    return events
+
+
+def _network_intervals(events):
+    intervals = []
+    for event in events:
+        if event.get("type") != "resource-snapshot":
+            continue
+        entry = event.get("snapshot", {})
+        start = entry.get("_monotonicTime")
+        if start is None or entry.get("time", -1) < 0:
+            continue
+        intervals.append((start, start + entry["time"]))
+    return sorted(intervals)
+
+
+def _covered_ms(intervals, start, end):
+    """Time within [start, end] covered by at least one network request."""
+    covered, cursor = 0.0, start
+    for lo, hi in intervals:
+        if lo >= end:
+            break
+        lo, hi = max(lo, cursor), min(hi, end)
+        if hi > lo:
+            covered += hi - lo
+            cursor = hi
+    return covered
+
+
+def parse_trace(path):
+    """
+    Return one dict per Playwright action in the trace zip:
+    action, selector, duration, wait, actionability, network time, retries, error.
+    """
+    with zipfile.ZipFile(path) as archive:
+        trace_events = _read_jsonl(archive, ".trace")
+        network = _network_intervals(_read_jsonl(archive, ".network"))
+
+    calls, logs = {}, {}
+    for event in trace_events:
+        kind = event.get("type")
+        if kind == "before":
+            calls[event["callId"]] = event
+        elif kind == "after" and event.get("callId") in calls:
+            calls[event["callId"]]["_after"] = event
+        elif kind == "log":
+            logs.setdefault(event.get("callId"), []).append(event)
+
+    actions = []
+    for call_id, before in calls.items():
+        after = before.get("_after")
+        if not after or not after.get("endTime"):
+            continue
+        start, end = before["startTime"], after["endTime"]
+        method = before.get("method", "")
+        params = before.get("params") or {}
+        call_logs = logs.get(call_id, [])
+
+        duration = max(0.0, end - start)
+        performing = next((log["time"] for log in call_logs if "performing" in log["message"]), None)
+        if method in WAIT_METHODS:
+            wait, actionability = duration, 0.0
+        else:
+            wait = 0.0
+            actionability = (performing - start) if performing is not None else 0.0
+
+        actions.append({
+            "action": f"{before.get('class', '')}.{method}".strip("."),
+            "selector": params.get("selector") or params.get("url") or "",
+            "duration_ms": duration,
+            "wait_ms": wait,
+            "actionability_ms": max(0.0, actionability),
+            "network_ms": _covered_ms(network, start, end),
+            "retries": sum(1 for log in call_logs if log["message"].lstrip().startswith("retrying")),
+            "error": bool(after.get("error")),
+        })
+    return actions
+
+
+def aggregate(trace_root):
+    """Aggregate actions across all runs, keyed by (keyword, action, selector)."""
+    rows = {}
+    for path in sorted(glob.glob(os.path.join(trace_root, "**", "*.zip"), recursive=True)):
+        keyword_name = os.path.basename(os.path.dirname(path))
+        try:
+            actions = parse_trace(path)
+        except (zipfile.BadZipFile, ValueError, KeyError) as e:
+            print(f"Skipping unreadable trace {path}: {e}")
+            continue
+        for action in actions:
+            key = (keyword_name, action["action"], action["selector"])
+            row = rows.setdefault(key, {
+                "keyword": keyword_name, "action": action["action"], "selector": action["selector"],
+                "calls": 0, "total_ms": 0.0, "wait_ms": 0.0, "actionability_ms": 0.0,
+                "network_ms": 0.0, "retries": 0, "errors": 0,
+            })
+            row["calls"] += 1
+            row["total_ms"] += action["duration_ms"]
+            row["wait_ms"] += action["wait_ms"]
+            row["actionability_ms"] += action["actionability_ms"]
+            row["network_ms"] += action["network_ms"]
+            row["retries"] += action["retries"]
+            row["errors"] += int(action["error"])
+
+    result = []
+    for row in rows.values():
+        row["mean_ms"] = row["total_ms"] / row["calls"]
+        result.append(row)
+    return sorted(result, key=lambda r: r["total_ms"], reverse=True)
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: round(v, 1) if isinstance(v, float) else v for k, v in row.items()})
+
+
+def write_html(rows, path):
+    by_keyword = {}
+    for row in rows:
+        by_keyword.setdefault(row["keyword"], []).append(row)
+    keyword_totals = {name: sum(r["total_ms"] for r in items) for name, items in by_keyword.items()}
+    grand_total = sum(keyword_totals.values()) or 1.0
+
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Action profile</title><style>",
+        "body{font-family:sans-serif;margin:20px} .kw{margin:14px 0} .bar{display:flex;height:26px}",
+        ".cell{overflow:hidden;white-space:nowrap;font-size:11px;line-height:26px;padding:0 3px;",
+        "border-right:1px solid #fff;box-sizing:border-box;color:#222}",
+        ".wait{background:#f4a261} .act{background:#e9c46a} .net{background:#8ecae6} .other{background:#cdb4db}",
+        "table{border-collapse:collapse;font-size:12px;margin-top:24px} td,th{border:1px solid #ccc;padding:3px 6px}",
+        "</style></head><body><h2>Playwright action profile</h2>",
+        "<p>Bar width = share of keyword time. Colour = dominant component: ",
+        "<span class='cell wait'>wait</span> <span class='cell act'>actionability</span> ",
+        "<span class='cell net'>network</span> <span class='cell other'>execution</span></p>",
+    ]
+    for name, items in sorted(by_keyword.items(), key=lambda kv: -keyword_totals[kv[0]]):
+        total = keyword_totals[name] or 1.0
+        parts.append(
+            f"<div class='kw'><b>{html.escape(name)}</b> — {keyword_totals[name] / 1000:.1f}s "
+            f"({100 * keyword_totals[name] / grand_total:.0f}% of profiled time)"
+            f"<div class='bar' style='width:{max(5, 100 * keyword_totals[name] / grand_total):.1f}%'>"
+        )
+        for row in items:
+            components = {"wait": row["wait_ms"], "act": row["actionability_ms"], "net": row["network_ms"]}
+            dominant = max(components, key=components.get)
+            if components[dominant] < 0.5 * row["total_ms"]:
+                dominant = "other"
+            tip = (f"{row['action']} {row['selector']} | calls {row['calls']} | total {row['total_ms']:.0f} ms | "
+                   f"wait {row['wait_ms']:.0f} | actionability {row['actionability_ms']:.0f} | "
+                   f"network {row['network_ms']:.0f} | retries {row['retries']}")
+            parts.append(
+                f"<div class='cell {dominant}' style='width:{100 * row['total_ms'] / total:.2f}%' "
+                f"title='{html.escape(tip, quote=True)}'>{html.escape(row['action'])}</div>"
+            )
+        parts.append("</div></div>")
+
+    parts.append("<table><tr>" + "".join(f"<th>{c}</th>" for c in CSV_COLUMNS) + "</tr>")
+    for row in rows:
+        cells = []
+        for column in CSV_COLUMNS:
+            value = row[column]
+            cells.append(f"<td>{html.escape(f'{value:.0f}' if isinstance(value, float) else str(value))}</td>")
+        parts.append("<tr>" + "".join(cells) + "</tr>")
+    parts.append("</table></body></html>")
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate Playwright traces into an action hot-spot profile")
+    parser.add_argument("--traces", default="results/traces", help="Directory with <keyword>/<run>.zip traces")
+    parser.add_argument("--output-dir", default="results", help="Where to write action_profile.csv/.html")
+    args = parser.parse_args(argv)
+
+    rows = aggregate(args.traces)
+    if not rows:
+        print(f"No traces found under {args.traces} (run with JIRA_PROFILE_TRACES=1)")
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    csv_path = os.path.join(args.output_dir, "action_profile.csv")
+    html_path = os.path.join(args.output_dir, "action_profile.html")
+    write_csv(rows, csv_path)
+    write_html(rows, html_path)
+
+    print(f"{'total ms':>10} {'calls':>5}  keyword / action / selector")
+    for row in rows[:15]:
+        print(f"{row['total_ms']:10.0f} {row['calls']:5d}  {row['keyword']} / {row['action']} / {row['selector'][:60]}")
+    print(f"Wrote {csv_path} and {html_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+import itertools
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "Library"))
+
+import JiraPerfGate as gate  # noqa: E402
+
+
+def exact_p_greater(current, baseline):
+    """P(U >= observed) over all splits of the pooled samples (no ties)."""
+    pooled = current + baseline
+    observed = sum(1 for c in current for b in baseline if c > b)
+    hits = total = 0
+    for picked in itertools.combinations(range(len(pooled)), len(current)):
+        cur = [pooled[i] for i in picked]
+        base = [pooled[i] for i in range(len(pooled)) if i not in picked]
+        total += 1
+        hits += sum(1 for c in cur for b in base if c > b) >= observed
+    return hits / total
+
+
+def write_output(path, seconds):
+    """Minimal RF 7 output.xml with one passing test holding one top-level keyword."""
+    path.write_text(
+        "<robot><suite name='S'><test name='T'>"
+        f"<kw name='K' owner='Lib'><status status='PASS' elapsed='{seconds}'/></kw>"
+        f"<status status='PASS' elapsed='{seconds}'/></test>"
+        f"<status status='PASS' elapsed='{seconds}'/></suite></robot>",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_mann_whitney_u_counts_pairs():
+    u, _ = gate.mann_whitney_greater([3.0, 5.0], [1.0, 4.0, 6.0])
+    assert u == 3
+
+
+def test_mann_whitney_p_close_to_exact():
+    current = [10.4, 11.2, 12.9, 13.1, 9.8]
+    baseline = [9.1, 9.5, 10.0, 8.7, 9.9, 10.2]
+    _, p = gate.mann_whitney_greater(current, baseline)
+    assert abs(p - exact_p_greater(current, baseline)) < 0.01
+
+
+def test_mann_whitney_identical_samples_not_significant():
+    _, p = gate.mann_whitney_greater([2.0, 2.0, 2.0], [2.0, 2.0, 2.0])
+    assert p == 1.0
+
+
+def verdicts(rows):
+    return {row["metric"]: row["verdict"] for row in rows}
+
+
+def test_compare_verdicts():
+    baseline = {"slow": [10.0] * 20, "fast": [10.0] * 20, "noise": [10.0] * 20, "flat": [10.0] * 20}
+    current = {"slow": [15.0, 16.0, 15.5], "fast": [5.0, 5.5, 6.0], "noise": [10.3, 10.2, 10.4],
+               "flat": [10.0, 10.0, 10.0], "new": [1.0]}
+    assert verdicts(gate.compare(baseline, current)) == {
+        "slow": "REGRESSION", "fast": "IMPROVED", "noise": "OK", "flat": "OK", "new": "NEW",
+    }
+
+
+def test_compare_single_sample_only_warns():
+    rows = gate.compare({"t": [15.0] * 50}, {"t": [40.0]})
+    assert verdicts(rows) == {"t": "WARN"}
+
+
+def test_recent_runs_turn_a_sustained_slowdown_into_regression(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps({"metrics": {"test:T": [15.0] * 20}, "runs": 20}), encoding="utf-8")
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    for stamp in ("20260101T000000", "20260102T000000"):
+        write_output(archive / f"{stamp}-output.xml", 40.0)
+    current = write_output(tmp_path / "output.xml", 40.0)
+
+    args = ["--current", current, "--baseline", str(baseline_path), "--fail"]
+    assert gate.main(args) == 0
+    assert gate.main(args + ["--recent", str(archive / "*.xml"), "--window", "3"]) == gate.EXIT_REGRESSION
+
+
+def test_flagged_metrics_stay_out_of_the_baseline(tmp_path):
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps({"metrics": {"test:T": [15.0] * 20}, "runs": 20}), encoding="utf-8")
+    current = write_output(tmp_path / "output.xml", 40.0)
+
+    gate.main(["--current", current, "--baseline", str(baseline_path), "--update-baseline"])
+    metrics = json.loads(baseline_path.read_text(encoding="utf-8"))["metrics"]
+    assert metrics["test:T"] == [15.0] * 20
+    assert metrics["keyword:Lib.K"] == [40.0]
@@ -1,9 +1,54 @@
 #!/bin/bash
-echo "Loading .env from: $ENV_FILE_PATH"
-python -c "
-from dotenv import load_dotenv
-import os
-print('Loaded .env from:', os.getenv('ENV_FILE_PATH'))
-load_dotenv(os.getenv('ENV_FILE_PATH'))
-"
-robot -d results Tests/Test_E2Eflow_JiraIssue_Task.robot
+# .env ($ENV_FILE_PATH) and Doppler secrets are loaded in-process by INITIALIZE SECRETS
+SUITE=Tests/Test_E2Eflow_JiraIssue_Task.robot
+# Per-library import times and Playwright usage -> <output dir>/startup_profile.json
+LISTENER=Library/JiraStartupProfiler.py
+
+if [ -n "$SHARD_TOTAL" ]; then
+  # Sharded run: only this node's share of the suite, planned from historical durations
+  SHARD_DIR=results/shard-${SHARD_INDEX:-0}
+  mkdir -p "$SHARD_DIR"
+  python Library/JiraSuiteSharding.py --suite "$SUITE" \
+    --shards "$SHARD_TOTAL" --index "${SHARD_INDEX:-0}" \
+    --history "${SHARD_HISTORY:-results/**/output.xml}" --history Tests/output.xml \
+    --output "$SHARD_DIR/shard.args"
+  status=$?
+  if [ $status -eq 3 ]; then
+    echo "Shard ${SHARD_INDEX:-0} has no tests to run"
+    exit 0
+  elif [ $status -ne 0 ]; then
+    exit $status
+  fi
+  OUT_DIR=$SHARD_DIR
+  robot --listener "$LISTENER" -d "$OUT_DIR" --argumentfile "$SHARD_DIR/shard.args" "$SUITE"
+else
+  OUT_DIR=results
+  robot --listener "$LISTENER" -d "$OUT_DIR" "$SUITE"
+fi
+rc=$?
+
+ARCHIVE_DIR=${RESULTS_ARCHIVE_DIR:-$OUT_DIR/archive}
+# Perf gate against ~/.cache/jira-automation/perf_baseline.json (JIRA_PERF_BASELINE): PERF_GATE=1 flags,
+# PERF_GATE=fail fails the run. One run gives one sample per test, so it is gated together with the
+# last archived runs (PERF_RECENT, PERF_WINDOW runs in total); runs before archiving this one.
+if [ -n "$PERF_GATE" ]; then
+  GATE_ARGS=(--current "$OUT_DIR/output.xml" --recent "${PERF_RECENT:-$ARCHIVE_DIR/*-output.compact.xml.gz}"
+             --window "${PERF_WINDOW:-5}")
+  [ "$PERF_GATE" = "fail" ] && GATE_ARGS+=(--fail)
+  [ -n "$PERF_BASELINE_UPDATE" ] && GATE_ARGS+=(--update-baseline)
+  python Library/JiraPerfGate.py "${GATE_ARGS[@]}"
+  gate=$?
+  if [ $rc -eq 0 ] && [ $gate -ne 0 ]; then
+    rc=$gate
+  fi
+fi
+
+# Compressed copy without passing keyword bodies + JSON timing summary for trend tooling,
+# archived inside the output dir (mounted/uploaded in CI) unless RESULTS_ARCHIVE_DIR says otherwise
+python Library/JiraResultCompactor.py "$OUT_DIR/output.xml" --archive-dir "$ARCHIVE_DIR"
+
+# COMPACT_ARTIFACTS=1: a passing run keeps only the compact output + summary (rebot renders from it after gunzip)
+if [ -n "$COMPACT_ARTIFACTS" ] && [ $rc -eq 0 ] && [ -f "$OUT_DIR/output.compact.xml.gz" ]; then
+  rm -f "$OUT_DIR/output.xml" "$OUT_DIR/log.html" "$OUT_DIR/report.html"
+fi
+exit $rc